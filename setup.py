@@ -3,7 +3,8 @@
 #
 # Update:
 #
-import re
+import ast
+import io
 
 from setuptools import find_packages
 from setuptools import setup
@@ -11,8 +12,11 @@ from setuptools import setup
 packages = []
 thisPackage = "wwpdb.io"
 
-with open("wwpdb/io/file/__init__.py", "r") as fd:
-    version = re.search(r'^__version__\s*=\s*[\'"]([^\'"]*)[\'"]', fd.read(), re.MULTILINE).group(1)
+# Pull the __version__ assignment out of the module AST - no regex scan, and no import of the package
+# (io.open and ast.literal_eval behave the same on every Python version listed in the classifiers)
+with io.open("wwpdb/io/file/__init__.py", "r", encoding="utf-8-sig") as fd:
+    tree = ast.parse(fd.read())
+version = next((ast.literal_eval(node.value) for node in tree.body if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "__version__"), None)
 
 if not version:
     raise RuntimeError("Cannot find version information")
@@ -52,7 +56,7 @@ setup(
     tests_require=["tox", "wwpdb.utils.testing", "nose"],
     #
     # Not configured ...
-    extras_require={"dev": ["check-manifest"], "test": ["coverage"]},
+    extras_require={"dev": ["check-manifest"], "test": ["coverage"], "parallel": ["pgzip"]},
     # Added for
     command_options={"build_sphinx": {"project": ("setup.py", thisPackage), "version": ("setup.py", version), "release": ("setup.py", version)}},
     # This setting for namespace package support -
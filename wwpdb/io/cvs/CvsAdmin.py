@@ -29,16 +29,25 @@ __version__ = "V0.001"
 
 import sys
 import os
+import re
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import traceback
 import tempfile
 import shutil
 
+# Non-blank log lines other than CVS '?' (unknown file) notices
+_LOG_LINE_RE = re.compile(rb"^(?!\?)[^\S\r\n]*\S[^\r\n]*", re.MULTILINE)
+
 
 class CvsWrapperBase(object):
     """Core wrapper class for opertations on cvs administrative operations on repositories."""
 
-    def __init__(self, tmpPath="./", verbose=True, log=sys.stderr):
+    def __init__(self, tmpPath="./", verbose=True, log=sys.stderr, persistLogs=False):
+        """CVS output and error text is captured in memory.  If persistLogs is set, it is also
+        written to the corresponding log files in the temporary working directory.
+        """
         self.__tmpPath = tmpPath
         #
         self.__verbose = verbose
@@ -54,42 +63,62 @@ class CvsWrapperBase(object):
         self._wrkPath = None
         self._cvsInfoFileName = "cvsInfo.txt"
         self._cvsErrorFileName = "cvsError.txt"
-        self.__outputFilePath = None
-        self.__errorFilePath = None
+        # Log keys for captured output - these become file paths once a working directory is made
+        self.__outputFilePath = self._cvsInfoFileName
+        self.__errorFilePath = self._cvsErrorFileName
+        self.__persistLogs = persistLogs
+        self.__logD = {}
+        self.__taskCounter = itertools.count()
 
     def setRepositoryPath(self, host, path):
         self._repositoryHost = host
         self._repositoryPath = path
+        self._cvsRoot = None
 
     def setAuthInfo(self, user, password):
         self._cvsUser = user
         self._cvsPassword = password
+        self._cvsRoot = None
 
-    def _getRedirect(self, fileNameOut="myLog.log", fileNameErr="myLog.log", append=False):
-        if append:
-            if fileNameOut == fileNameErr:
-                oReDir = " >> " + fileNameOut + " 2>&1 "
-            else:
-                oReDir = " >> " + fileNameOut + " 2>> " + fileNameErr
-        else:
-            if fileNameOut == fileNameErr:
-                oReDir = " > " + fileNameOut + " 2>&1 "
-            else:
-                oReDir = " > " + fileNameOut + " 2> " + fileNameErr
+    def _runCvsCommand(self, myCommand, outFilePath=None):
+        """Run the command steps in myCommand in order, returning the status of the last step.
 
-        return oReDir
+        Each step is a tuple (argv, cwd, outPath, errPath, append).  Output and error text are
+        captured as the logs for outPath and errPath (a single log when these are the same), and
+        are appended to existing log content when append is set.
 
-    def _runCvsCommand(self, myCommand):
+        If outFilePath is provided, standard output is instead written directly to that file.
+        """
+        ok = False
+        for argv, cwd, outPath, errPath, append in myCommand:
+            if outFilePath is None:
+                ok = self.__runCommandStep(argv, cwd, outPath, errPath, append)
+            else:
+                try:
+                    with open(outFilePath, "ab" if append else "wb") as ofh:
+                        ok = self.__runCommandStep(argv, cwd, outPath, errPath, append, stdout=ofh)
+                except OSError as e:
+                    self.__storeLog(errPath, ("%s: %s\n" % (outFilePath, str(e))).encode("utf-8"), append)
+                    ok = False
+        return ok
+
+    def __runCommandStep(self, argv, cwd, outPath, errPath, append, stdout=subprocess.PIPE):
         retcode = -100
+        cmdText = " ".join(argv)
         try:
             if self.__debug:
-                self.__lfh.write("+CvsWrapperBase._runCvsCommand Command: %s\n" % myCommand)
-
-            # retcode = subprocess.call(myCommand, stdout=self.__lfh, stderr=self.__lfh, shell=True)
-            retcode = subprocess.call(myCommand, shell=True)
+                self.__lfh.write("+CvsWrapperBase._runCvsCommand Command: %s\n" % cmdText)
+
+            proc = subprocess.Popen(argv, cwd=cwd, stdout=stdout, stderr=subprocess.STDOUT if errPath == outPath else subprocess.PIPE)
+            outData, errData = proc.communicate()
+            retcode = proc.returncode
+            if outData is not None:
+                self.__storeLog(outPath, outData, append)
+            if errData is not None:
+                self.__storeLog(errPath, errData, append)
             if retcode != 0:
                 if self.__verbose:
-                    self.__lfh.write("+CvsWrapperBase.(_runCvsCommand)  Failed command: %s\n" % myCommand)
+                    self.__lfh.write("+CvsWrapperBase.(_runCvsCommand)  Failed command: %s\n" % cmdText)
                     self.__lfh.write("+CvsWrapperBase(_runCvsCommand) Child was terminated by signal %r\n" % retcode)
                 return False
             else:
@@ -97,26 +126,66 @@ class CvsWrapperBase(object):
                     self.__lfh.write("+CvsWrapperBase(_runCvsCommand) Child was terminated by signal %r\n" % retcode)
                 return True
         except OSError as e:
-            if self.__verbose:
+            self.__storeLog(errPath, ("%s: %s\n" % (cmdText, str(e))).encode("utf-8"), append)
+            if self.__debug:
                 traceback.print_exc(file=self.__lfh)
+            if self.__verbose:
                 self.__lfh.write("+CvsWrapperBase(_runCvsCommand) Execution failed: %r\n" % e)
             return False
 
-    def _setCvsRoot(self):
+    def __storeLog(self, filePath, data, append):
+        if append:
+            self.__logD[filePath] = self.__logD.get(filePath, b"") + data
+        else:
+            self.__logD[filePath] = data
+        if self.__persistLogs:
+            try:
+                with open(filePath, "ab" if append else "wb") as ofh:
+                    ofh.write(data)
+            except OSError as e:
+                if self.__verbose:
+                    self.__lfh.write("+CvsWrapperBase(__storeLog) cannot write log %r %r\n" % (filePath, str(e)))
+
+    def _getLogText(self, filePath):
+        """Return the raw text captured for the log filePath (an empty string if there is none)."""
+        return self.__logD.get(filePath, b"").decode("utf-8", "replace")
+
+    def _removePath(self, dirPath):
+        """Remove the directory tree dirPath with the semantics of 'rm -rf', logging any failure to the error file."""
         try:
-            self._cvsRoot = ":pserver:" + self._cvsUser + ":" + self._cvsPassword + "@" + self._repositoryHost + ":" + self._repositoryPath
+            shutil.rmtree(dirPath)
             return True
-        except Exception as e:
-            self.__lfh.write("+CvsWrapperBase(_cvsRoot) failed")
-            self.__lfh.write(e)
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            self._appendErrorText("rm: cannot remove %s: %s\n" % (dirPath, str(e)))
             return False
 
+    def _appendErrorText(self, text):
+        self.__storeLog(self._getErrorFilePath(), text.encode("utf-8"), True)
+
+    def _setCvsRoot(self):
+        """Return the CVS root for the current repository and credentials (or None on failure).
+
+        The root is computed once and reused until setRepositoryPath() or setAuthInfo() is called.
+        """
+        if self._cvsRoot is None:
+            try:
+                self._cvsRoot = ":pserver:" + self._cvsUser + ":" + self._cvsPassword + "@" + self._repositoryHost + ":" + self._repositoryPath
+            except Exception as e:
+                self.__lfh.write("+CvsWrapperBase(_cvsRoot) failed %s\n" % str(e))
+        return self._cvsRoot
+
     def _getOutputFilePath(self):
-        self.__outputFilePath = os.path.join(self._wrkPath, self._cvsInfoFileName)
         return self.__outputFilePath
 
-    def _getErrorFilePath(self):
-        self.__errorFilePath = os.path.join(self._wrkPath, self._cvsErrorFileName)
+    def _getErrorFilePath(self, wrkPath=None):
+        """Return the error file path in the current working directory or, if provided, in wrkPath.
+
+        An explicit wrkPath leaves the instance state untouched so that concurrent callers can use separate working directories.
+        """
+        if wrkPath is not None:
+            return os.path.join(wrkPath, self._cvsErrorFileName)
         return self.__errorFilePath
 
     def _getOutputText(self):
@@ -125,89 +194,116 @@ class CvsWrapperBase(object):
             filePath = self.__outputFilePath
             return self.__getTextFile(filePath)
         except Exception as e:
-            if self.__verbose:
+            if self.__debug:
                 traceback.print_exc(file=self.__lfh)
+            if self.__verbose:
                 self.__lfh.write("+CvsWrapperBase(_getOutputText) path %r %r\n" % (self.__outputFilePath, str(e)))
 
         return text
 
-    def _getErrorText(self, filterInfo=False):
+    def _getErrorText(self, filterInfo=False, filePath=None):
         text = ""
         try:
-            filePath = self.__errorFilePath
+            filePath = self.__errorFilePath if filePath is None else filePath
             text = self.__getTextFile(filePath, filterInfo=filterInfo)
             if self.__verbose:
                 self.__lfh.write("+CvsWrapperBase(_getErrorText) path: %r  text: %s\n" % (filePath, text))
-                self.__lfh.flush()
         except Exception as e:
-            if self.__verbose:
+            if self.__debug:
                 traceback.print_exc(file=self.__lfh)
-                self.__lfh.write("+CvsWrapperBase(_getErrorText) path %r %r\n" % (self.__errorFilePath, str(e)))
-                self.__lfh.flush()
+            if self.__verbose:
+                self.__lfh.write("+CvsWrapperBase(_getErrorText) path %r %r\n" % (filePath, str(e)))
 
         return text
 
     def __getTextFile(self, filePath, filterInfo=False):  # pylint: disable=unused-argument
-        text = ""
-        try:
-            ifh = open(filePath, "r")
-            tL = []
-            for line in ifh:
-                if line.startswith("?"):
-                    continue
-                if len(str(line[:-1]).strip()) > 0:
-                    tL.append(line[:-1])
-            ifh.close()
-            text = "\n".join(set(tL))
-        except:  # noqa: E722 pylint: disable=bare-except
-            pass
-
-        return text
+        tL = _LOG_LINE_RE.findall(self.__logD.get(filePath, b""))
+        return b"\n".join(dict.fromkeys(tL)).decode("utf-8", "replace")
 
     def _makeTempWorkingDir(self):
+        if self._wrkPath is not None and os.path.isdir(self._wrkPath):
+            return
         if self.__tmpPath is not None and os.path.isdir(self.__tmpPath):
             self._wrkPath = os.path.abspath(tempfile.mkdtemp("tmpdir", "tmpCVS", self.__tmpPath))
 
         else:
             self._wrkPath = os.path.abspath(tempfile.mkdtemp("tmpdir", "tmpCVS"))
+        self.__outputFilePath = os.path.join(self._wrkPath, self._cvsInfoFileName)
+        self.__errorFilePath = os.path.join(self._wrkPath, self._cvsErrorFileName)
 
         if self.__debug:
             self.__lfh.write("+CvsWrapperBase(_makeTempWorkingDir) Working directory path set to  %r\n" % self._wrkPath)
 
+    def _makeLogWorkingDir(self):
+        """Create the temporary working directory when captured logs are also persisted to disk."""
+        if self.__persistLogs and self._wrkPath is None:
+            self._makeTempWorkingDir()
+
+    def _makeTaskWorkingPath(self):
+        """Return a separate working path for one of a set of concurrent operations.
+
+        This is a new temporary directory if logs are persisted and otherwise a unique in-memory log key.
+        """
+        if self.__persistLogs:
+            self._makeTempWorkingDir()
+            return tempfile.mkdtemp("tmpdir", "tmpCVS", self._wrkPath)
+        return "tmpCVS%dtask" % next(self.__taskCounter)
+
+    def _releaseTaskWorkingPath(self, wrkPath):
+        """Discard the captured logs of a working path from _makeTaskWorkingPath() once they have been read."""
+        self.__logD.pop(self._getErrorFilePath(wrkPath), None)
+
     def cleanup(self):
         """Cleanup any temporary files and directories created by this class."""
+        self.__logD = {}
         if self._wrkPath is not None and len(self._wrkPath) > 0:
-            try:
-                shutil.rmtree(self._wrkPath)
-                self._wrkPath = None
-                return True
-            except Exception as e:
-                self.__lfh.write("cleanup - unable to remove self._wrkpath")
-                self.__lfh.write(e)
+            shutil.rmtree(self._wrkPath, ignore_errors=True)
+            if os.path.exists(self._wrkPath):
+                self.__lfh.write("cleanup - unable to remove %s\n" % self._wrkPath)
                 return False
-        else:
-            return True
+            self._wrkPath = None
+            self.__outputFilePath = self._cvsInfoFileName
+            self.__errorFilePath = self._cvsErrorFileName
+        return True
 
 
 class CvsAdmin(CvsWrapperBase):
     """Wrapper class for opertations on cvs administrative operations on repositories."""
 
-    def __init__(self, tmpPath="./", verbose=True, log=sys.stderr):
-        super(CvsAdmin, self).__init__(tmpPath=tmpPath, verbose=verbose, log=log)
+    def __init__(self, tmpPath="./", verbose=True, log=sys.stderr, cacheHistory=False, persistLogs=False):
+        """If cacheHistory is set, successful history and revision queries are retained per
+        repository and path until invalidateHistory() is called.
+        """
+        super(CvsAdmin, self).__init__(tmpPath=tmpPath, verbose=verbose, log=log, persistLogs=persistLogs)
         #
         self.__verbose = verbose
         self.__lfh = log
+        self.__cacheHistory = cacheHistory
+        self.__historyCache = {}
+
+    def invalidateHistory(self, cvsPath=None):
+        """Discard cached history results for cvsPath or, if cvsPath is None, for all paths."""
+        if cvsPath is None:
+            self.__historyCache.clear()
+        else:
+            for ky in [ky for ky in self.__historyCache if ky[1] == cvsPath]:
+                del self.__historyCache[ky]
 
     def getHistory(self, cvsPath):
         """Return the history text for project files identified by cvsPath in the
         current repository.
         """
+        ky = (self._setCvsRoot(), cvsPath, True)
+        if ky in self.__historyCache:
+            return (True, self.__historyCache[ky])
         text = ""
         ok = False
         cmd = self.__getHistoryCmd(cvsPath, True)
         if cmd is not None:
             ok = self._runCvsCommand(myCommand=cmd)
             text = self._getOutputText()
+            if ok and self.__cacheHistory:
+                self.__historyCache[ky] = text
         else:
             text = "History command failed with repository command processing error"
 
@@ -218,12 +314,17 @@ class CvsAdmin(CvsWrapperBase):
 
         Return data has the for [(RevId, A/M, timeStamp),...] where A=Added and M=Modified.
         """
+        ky = (self._setCvsRoot(), cvsPath, False)
+        if ky in self.__historyCache:
+            return (True, list(self.__historyCache[ky]))
         revList = []
         ok = False
         cmd = self.__getHistoryCmd(cvsPath)
         if cmd is not None:
             ok = self._runCvsCommand(myCommand=cmd)
             revList = self.__extractRevisions()
+            if ok and self.__cacheHistory:
+                self.__historyCache[ky] = list(revList)
         else:
             _text = "Revision history command failed with repository command processing error"  # noqa: F841
 
@@ -233,7 +334,8 @@ class CvsAdmin(CvsWrapperBase):
         """Perform CVS checkout operation for the project files identified by the input cvsPath
         subject to the input revision identifier.
 
-        Files that are checked out are then subsequently copied to outPath.
+        File contents are streamed from the repository into a temporary file alongside outPath
+        which replaces outPath only if the checkout succeeds.
 
         Note that outPath will not be a CVS working copy (sandbox) after this operation.
         """
@@ -243,9 +345,19 @@ class CvsAdmin(CvsWrapperBase):
         if self.__verbose:
             self.__lfh.write("+CvsAdmin(checkOutFile) Cvs directory %s   target file name %s\n" % (pth, fn))
         if len(fn) > 0:
-            cmd = self.__getCheckOutCmd(cvsPath, outPath, revId)
+            cmd = self.__getCheckOutCmd(cvsPath, revId)
             if cmd is not None:
-                ok = self._runCvsCommand(myCommand=cmd)
+                outPathAbs = os.path.abspath(outPath)
+                tmpOutPath = os.path.join(os.path.dirname(outPathAbs), ".%s.%d.cvstmp" % (os.path.basename(outPathAbs), os.getpid()))
+                ok = self._runCvsCommand(myCommand=cmd, outFilePath=tmpOutPath)
+                try:
+                    if ok:
+                        os.replace(tmpOutPath, outPathAbs)
+                    elif os.path.exists(tmpOutPath):
+                        os.remove(tmpOutPath)
+                except OSError as e:
+                    self._appendErrorText("cannot write %s: %s\n" % (outPathAbs, str(e)))
+                    ok = False
                 text = self._getErrorText()
             else:
                 text = "Check out failed with repository command processing error"
@@ -257,101 +369,47 @@ class CvsAdmin(CvsWrapperBase):
 
     def __getHistoryCmd(self, cvsPath, incldel=False):
         """Generate command to retrieve history.  If incldel is set, include removed revisions"""
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
+        self._makeLogWorkingDir()
         outPath = self._getOutputFilePath()
         errPath = self._getErrorFilePath()
 
         if incldel:
-            opts = "AMR "
+            opts = "AMR"
         else:
-            opts = "AM "
+            opts = "AM"
         if self._setCvsRoot():
-            cmd = "cvs -d " + self._cvsRoot + " history -a -x " + opts + cvsPath + self._getRedirect(fileNameOut=outPath, fileNameErr=errPath)
+            cmd = [(["cvs", "-d", self._cvsRoot, "history", "-a", "-x", opts, cvsPath], None, outPath, errPath, False)]
         else:
             cmd = None
         return cmd
 
-    def __getCheckOutCmd(self, cvsPath, outPath, revId=None):
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
+    def __getCheckOutCmd(self, cvsPath, revId=None):
+        """Check out file contents to standard output ('co -p')."""
+        self._makeLogWorkingDir()
         errPath = self._getErrorFilePath()
         (pth, fn) = os.path.split(cvsPath)
         if self.__verbose:
             self.__lfh.write("+CvsAdmin(__getCheckOutCmd) CVS directory %s  target file name %s\n" % (pth, fn))
-        lclPath = os.path.join(self._wrkPath, cvsPath)
-        outPathAbs = os.path.abspath(outPath)
-        #
         #
         if self._setCvsRoot():
-            if revId is None:
-                rS = " "
-                cmd = (
-                    "cd "
-                    + self._wrkPath
-                    + " ; cvs -d "
-                    + self._cvsRoot
-                    + " co "
-                    + cvsPath
-                    + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath)
-                    + " ; "
-                    + " mv -f  "
-                    + lclPath
-                    + " "
-                    + outPathAbs
-                    + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True)
-                    + " ; "
-                )
-                # cmd="cvs -d " +  self._cvsRoot  + " co -d " + self._wrkPath + " " + cvsPath +  \
-                #     self._getRedirect(fileNameOut=errPath,fileNameErr=errPath) + ' ; '  + \
-                #     " mv -f  " + lclPath + " " + outPath + self._getRedirect(fileNameOut=errPath,fileNameErr=errPath,append=True) + ' ; '
-            else:
-                rS = " -r " + revId + " "
-                cmd = (
-                    "cd "
-                    + self._wrkPath
-                    + "; cvs -d "
-                    + self._cvsRoot
-                    + " co "
-                    + rS
-                    + " "
-                    + cvsPath
-                    + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath)
-                    + " ; "
-                    + " mv -f  "
-                    + lclPath
-                    + " "
-                    + outPathAbs
-                    + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True)
-                    + " ; "
-                )
-                # cmd="cvs -d " +  self._cvsRoot  + " co -d " + self._wrkPath + rS +  " " + cvsPath + \
-                #     self._getRedirect(fileNameOut=errPath,fileNameErr=errPath) + ' ; '  + \
-                #     " mv -f  " + lclPath + " " + outPath + self._getRedirect(fileNameOut=errPath,fileNameErr=errPath,append=True) + ' ; '
+            rL = [] if revId is None else ["-r", revId]
+            cmd = [(["cvs", "-d", self._cvsRoot, "co", "-p"] + rL + [cvsPath], None, self._getOutputFilePath(), errPath, False)]
         else:
             cmd = None
         return cmd
 
     def __extractRevisions(self):
-        """Extract revisions details from the last history command."""
-        revList = []
-        try:
-            fName = self._getOutputFilePath()
-            if self.__verbose:
-                self.__lfh.write("+CvsAdmin(__extraRevisions) Reading revisions from %r\n" % fName)
-            ifh = open(fName, "r")
-            for line in ifh.readlines():
-                fields = line[:-1].split()
-                typeCode = str(fields[0])
-                revId = str(fields[5])
-                timeStamp = str(fields[1] + ":" + fields[2])
-                revList.append((revId, typeCode, timeStamp))
-        except Exception as e:
-            if self.__verbose:
-                self.__lfh.write("+CvsAdmin(__extraRevisions) Extracting revision list for : %s %s\n" % (fName, str(e)))
+        """Extract revisions details from the last history command.
 
+        History lines with fewer than six fields (e.g. 'No records selected.') are skipped.
+        """
+        fName = self._getOutputFilePath()
+        if self.__verbose:
+            self.__lfh.write("+CvsAdmin(__extraRevisions) Reading revisions from %r\n" % fName)
+        revList = [(fields[5], fields[0], fields[1] + ":" + fields[2]) for fields in (line.split() for line in self._getLogText(fName).splitlines()) if len(fields) >= 6]
         revList.reverse()
-        self.__lfh.write("Ordered revision list %r\n" % revList)
+        if self.__verbose:
+            self.__lfh.write("Ordered revision list %r\n" % revList)
 
         return revList
 
@@ -359,14 +417,16 @@ class CvsAdmin(CvsWrapperBase):
 class CvsSandBoxAdmin(CvsWrapperBase):
     """Wrapper class for opertations on cvs working directories (aka cvs sandboxes)."""
 
-    def __init__(self, tmpPath="./", verbose=True, log=sys.stderr):
-        super(CvsSandBoxAdmin, self).__init__(tmpPath=tmpPath, verbose=verbose, log=log)
+    def __init__(self, tmpPath="./", verbose=True, log=sys.stderr, persistLogs=False):
+        super(CvsSandBoxAdmin, self).__init__(tmpPath=tmpPath, verbose=verbose, log=log, persistLogs=persistLogs)
         #
         self.__verbose = verbose
         self.__lfh = log
         self.__debug = False
         #
         self.__sandBoxTopPath = None
+        self.__projectPathD = {}
+        self.__writableProjectS = set()
 
     def setSandBoxTopPath(self, dirPath):
         """Assign the path that contains or will contain the working copy of the cvs project."""
@@ -376,28 +436,56 @@ class CvsSandBoxAdmin(CvsWrapperBase):
             except Exception as e:
                 self.__lfh.write("+setSandBoxTopPath - can't make sandboxpath: %s\n" % str(e))
         if os.access(dirPath, os.W_OK):
-            self.__sandBoxTopPath = dirPath
+            self.__sandBoxTopPath = os.path.abspath(dirPath)
+            self.__projectPathD = {}
+            self.__writableProjectS = set()
             return True
         else:
             self.__lfh.write("+setSandBoxTopPath - can't access sandboxpath\n")
             return False
 
     def getSandBoxTopPath(self):
-        return os.path.abspath(self.__sandBoxTopPath)
+        return self.__sandBoxTopPath
+
+    def __getProjectPath(self, projectDir):
+        """Return the (cached) absolute path of projectDir within the sandbox."""
+        try:
+            return self.__projectPathD[projectDir]
+        except KeyError:
+            pth = self.__projectPathD[projectDir] = os.path.join(self.__sandBoxTopPath, projectDir)
+            return pth
+
+    def __isWritableProject(self, projectDir):
+        """Return True if the project directory is writable -  positive results are cached
+        until the sandbox path changes, a directory is removed from the project or the
+        project directory itself is found to be missing.
+        """
+        projectPath = self.__getProjectPath(projectDir)
+        if projectDir in self.__writableProjectS:
+            if os.path.isdir(projectPath):
+                return True
+            self.__writableProjectS.discard(projectDir)
+        if os.access(projectPath, os.W_OK):
+            self.__writableProjectS.add(projectDir)
+            return True
+        return False
 
-    def checkOut(self, projectPath=None, revId=None):
-        """Create CVS sandbox working copy of the input project path within the current repository."""
+    def checkOut(self, projectPath=None, revId=None, wrkPath=None):
+        """Create CVS sandbox working copy of the input project path within the current repository.
+
+        An optional wrkPath overrides the temporary working directory used for diagnostic files.
+        """
         if self.__verbose:
             self.__lfh.write("\n+CvsSandBoxAdmin(checkOut) Checking out CVS repository working path %s project file path %s\n" % (self.__sandBoxTopPath, projectPath))
         text = ""
         ok = False
         if self.__sandBoxTopPath is not None and projectPath is not None:
-            cmd = self.__getCheckOutProjectCmd(projectPath, revId=revId)
+            cmd = self.__getCheckOutProjectCmd(projectPath, revId=revId, wrkPath=wrkPath)
             if self.__verbose:
                 self.__lfh.write("\n+CvsSandBoxAdmin(checkOut) checkout command %s\n" % cmd)
             if cmd is not None:
                 ok = self._runCvsCommand(myCommand=cmd)
-                text = self._getErrorText()
+                text = self._getErrorText(filePath=None if wrkPath is None else self._getErrorFilePath(wrkPath))
             else:
                 text = "Check out failed with repository command processing error"
         else:
@@ -412,41 +500,75 @@ class CvsSandBoxAdmin(CvsWrapperBase):
         input is [(CvsProjectDir, relativePath, pruneFlag),...]
 
         returns -  successList,resultList=successList,diagList
+
+        Updates are run serially by default, sharing the instance error log as update() does.  Set
+        optionsD["numThreads"] > 1 to opt in to running the updates on that many worker threads.  Updates
+        within the same project directory always run in sequence on a single thread, since they share the
+        sandbox CVS administrative files, and each threaded update uses a separate working path for its
+        diagnostics.  Results are returned in input order.
         """
         retList = []
         diagTextList = []
-        for dTup in dataList:
+        numThreads = optionsD.get("numThreads", 1) if optionsD else 1
+        if numThreads > 1 and len(dataList) > 1:
+            # one task list per project directory - updates sharing a sandbox project are never concurrent
+            projectD = {}
+            for ii, dTup in enumerate(dataList):
+                projectD.setdefault(dTup[0], []).append((ii, dTup, self._makeTaskWorkingPath()))
+            resultList = [None] * len(dataList)
+            with ThreadPoolExecutor(max_workers=min(numThreads, len(projectD))) as executor:
+                for future in [executor.submit(self.__updateProject, pTaskList) for pTaskList in projectD.values()]:
+                    for ii, result in future.result():
+                        resultList[ii] = result
+        else:
+            resultList = [result for _ii, result in self.__updateProject([(ii, dTup, None) for ii, dTup in enumerate(dataList)])]
+        logBuf = []
+        for dTup, (ok, text) in zip(dataList, resultList):
             pDir, relPath, _prune = dTup
-            ok, text = self.update(projectDir=pDir, relProjectPath=relPath, prune=True, fetchErrorLog=True, appendErrors=True)
             diagTextList.append(text)
             if self.__verbose:
-                self.__lfh.write("+CvsSandBoxAdmin(updateList) process %s project %s path %s status %r diagnostics:\n%s\n" % (procName, pDir, relPath, ok, text))
-                self.__lfh.write("\n+CvsSandBoxAdmin(updateList) current diagnostics length %d\n" % len(diagTextList))
-                self.__lfh.flush()
+                logBuf.append("+CvsSandBoxAdmin(updateList) process %s project %s path %s status %r diagnostics:\n%s\n" % (procName, pDir, relPath, ok, text))
             if ok:
                 retList.append(dTup)
+        if self.__verbose:
+            logBuf.append("\n+CvsSandBoxAdmin(updateList) diagnostics length %d\n" % len(diagTextList))
+            self.__lfh.write("".join(logBuf))
+            self.__lfh.flush()
         return retList, retList, diagTextList
 
-    def update(self, projectDir, relProjectPath=".", prune=False, fetchErrorLog=True, appendErrors=False):
+    def __updateProject(self, taskList):
+        """Run in sequence the updates [(index, (CvsProjectDir, relativePath, pruneFlag), wrkPath),...] for one project.
+
+        A task working path (wrkPath not None) is released once its diagnostics have been read.
+        """
+        resultList = []
+        for ii, dTup, wrkPath in taskList:
+            resultList.append((ii, self.update(projectDir=dTup[0], relProjectPath=dTup[1], prune=True, fetchErrorLog=True, appendErrors=True, wrkPath=wrkPath)))
+            if wrkPath is not None:
+                self._releaseTaskWorkingPath(wrkPath)
+        return resultList
+
+    def update(self, projectDir, relProjectPath=".", prune=False, fetchErrorLog=True, appendErrors=False, wrkPath=None):
         """Update CVS sandbox working copy of the input project path.   The project path must
         correspond to an existing working copy of the repository.
 
+        An optional wrkPath overrides the temporary working directory used for diagnostic files.
         """
         if self.__verbose:
             self.__lfh.write(
                 "\n+CvsSandBoxAdmin(update) Updating CVS repository working path %s project %s relative file path %s\n" % (self.__sandBoxTopPath, projectDir, relProjectPath)
             )
-        targetPath = os.path.join(self.__sandBoxTopPath, projectDir)
+        targetPath = self.__getProjectPath(projectDir)
         text = ""
         ok = False
-        if os.access(targetPath, os.W_OK):
-            cmd = self.__getUpdateCmd(projectDir, relProjectPath=relProjectPath, prune=prune, appendErrors=appendErrors)
+        if self.__isWritableProject(projectDir):
+            cmd = self.__getUpdateCmd(projectDir, relProjectPath=relProjectPath, prune=prune, appendErrors=appendErrors, wrkPath=wrkPath)
             if self.__debug:
                 self.__lfh.write("\n+CvsSandBoxAdmin(update) update command %s\n" % cmd)
             if cmd is not None:
                 ok = self._runCvsCommand(myCommand=cmd)
                 if fetchErrorLog:
-                    text = self._getErrorText(filterInfo=True)
+                    text = self._getErrorText(filterInfo=True, filePath=None if wrkPath is None else self._getErrorFilePath(wrkPath))
                 else:
                     text = "+CvsSandBoxAdmin(update) failing update command %s" % cmd
             else:
@@ -462,7 +584,7 @@ class CvsSandBoxAdmin(CvsWrapperBase):
             if os.access(self.__sandBoxTopPath, os.W_OK):
                 # try a full checkout --
                 #
-                ok, text = self.checkOut(projectPath=projectDir, revId=None)
+                ok, text = self.checkOut(projectPath=projectDir, revId=None, wrkPath=wrkPath)
             else:
                 text = "Update failed with repository project path issue: %s" % targetPath
                 self.__lfh.write("+ERROR - CvsSandBoxAdmin(update) cannot update project path %s\n" % targetPath)
@@ -476,7 +598,7 @@ class CvsSandBoxAdmin(CvsWrapperBase):
         """
         if self.__verbose:
             self.__lfh.write("\n+CvsSandBoxAdmin(add) Add %s to project %s in CVS repository working path %s\n" % (relProjectPath, projectDir, self.__sandBoxTopPath))
-        targetPath = os.path.join(self.__sandBoxTopPath, projectDir, relProjectPath)
+        targetPath = os.path.join(self.__getProjectPath(projectDir), relProjectPath)
         text = ""
         ok = False
         if os.access(targetPath, os.W_OK):
@@ -501,7 +623,7 @@ class CvsSandBoxAdmin(CvsWrapperBase):
             self.__lfh.write(
                 "\n+CvsSandBoxAdmin(commit) Commit changes to %s in project %s in CVS repository working path %s\n" % (relProjectPath, projectDir, self.__sandBoxTopPath)
             )
-        targetPath = os.path.join(self.__sandBoxTopPath, projectDir, relProjectPath)
+        targetPath = os.path.join(self.__getProjectPath(projectDir), relProjectPath)
         text = ""
         ok = False
         if os.access(targetPath, os.W_OK):
@@ -532,7 +654,7 @@ class CvsSandBoxAdmin(CvsWrapperBase):
         if (relProjectPath is None) or (len(relProjectPath) < 3):
             return (ok, text)
         #
-        targetPath = os.path.join(self.__sandBoxTopPath, projectDir, relProjectPath)
+        targetPath = os.path.join(self.__getProjectPath(projectDir), relProjectPath)
 
         if self.__verbose:
             self.__lfh.write("\n+CvsSandBoxAdmin(remove) Remove target file path is %s\n" % targetPath)
@@ -540,18 +662,8 @@ class CvsSandBoxAdmin(CvsWrapperBase):
         if os.access(targetPath, os.W_OK):
             #
             if saveCopy:
-                (_pth, fn) = os.path.split(relProjectPath)
-                folder_removed = os.path.join(self.__sandBoxTopPath, projectDir, "REMOVED")
-                if not os.path.isdir(folder_removed):
-                    os.mkdir(folder_removed)
-                savePath = os.path.join(folder_removed, fn)
-
-                # relSavePath = os.path.join("REMOVED", fn)
-                shutil.copyfile(targetPath, savePath)
-                # (ok1,saveText)=self.add(projectDir,relSavePath)
-                # if not ok1:
-                #    return (ok1,saveText)
-            cmd = self.__getRemoveCommitCmd(projectDir, relProjectPath)
+                self.__saveRemovedCopy(projectDir, relProjectPath, targetPath)
+            cmd = self.__getRemoveCommitCmd(projectDir, [relProjectPath])
             if cmd is not None:
                 ok = self._runCvsCommand(myCommand=cmd)
                 text = self._getErrorText()
@@ -563,6 +675,57 @@ class CvsSandBoxAdmin(CvsWrapperBase):
 
         return (ok, text)
 
+    def removeList(self, projectDir, relProjectPathList, message="File removed", saveCopy=True):
+        """Remove from the CVS sandbox working copy the input list of project paths with a single
+        cvs remove and a single commit.   Each project path must correspond to an existing path
+        in the local working copy - otherwise nothing is removed.
+
+        if saveCopy=True then preserve a copy of each remove target in the reserved REMOVED path
+        of the repository.
+        """
+        if self.__verbose:
+            self.__lfh.write(
+                "\n+CvsSandBoxAdmin(removeList) Remove %r from project %s in CVS repository working path %s\n" % (relProjectPathList, projectDir, self.__sandBoxTopPath)
+            )
+
+        text = ""
+        ok = False
+        if not relProjectPathList or any((relProjectPath is None) or (len(relProjectPath) < 3) for relProjectPath in relProjectPathList):
+            return (ok, text)
+        #
+        targetPathList = [os.path.join(self.__getProjectPath(projectDir), relProjectPath) for relProjectPath in relProjectPathList]
+        badPathList = [targetPath for targetPath in targetPathList if not os.access(targetPath, os.W_OK)]
+        if badPathList:
+            text = "Remove failed due with repository project path issue: %s" % " ".join(badPathList)
+            self.__lfh.write("+ERROR - CvsSandBoxAdmin(removeList) cannot remove project paths %s\n" % " ".join(badPathList))
+            return (ok, text)
+
+        if saveCopy:
+            for relProjectPath, targetPath in zip(relProjectPathList, targetPathList):
+                self.__saveRemovedCopy(projectDir, relProjectPath, targetPath)
+        cmd = self.__getRemoveCommitCmd(projectDir, relProjectPathList, message=message)
+        if cmd is not None:
+            ok = self._runCvsCommand(myCommand=cmd)
+            text = self._getErrorText()
+        else:
+            text = "Remove failed with repository command processing error"
+
+        return (ok, text)
+
+    def __saveRemovedCopy(self, projectDir, relProjectPath, targetPath):
+        (_pth, fn) = os.path.split(relProjectPath)
+        folder_removed = os.path.join(self.__getProjectPath(projectDir), "REMOVED")
+        if not os.path.isdir(folder_removed):
+            os.mkdir(folder_removed)
+        savePath = os.path.join(folder_removed, fn)
+
+        # relSavePath = os.path.join("REMOVED", fn)
+        # A real copy rather than a hard link - the working file survives a failed 'cvs remove' and may still be edited in place
+        shutil.copy2(targetPath, savePath)
+        # (ok1,saveText)=self.add(projectDir,relSavePath)
+        # if not ok1:
+        #    return (ok1,saveText)
+
     def removeDir(self, projectDir, relProjectPath):
         """Remove from the CVS sandbox working directory the input empty directory."""
         if self.__verbose:
@@ -573,13 +736,15 @@ class CvsSandBoxAdmin(CvsWrapperBase):
         if (relProjectPath is None) or (len(relProjectPath) < 3):
             return (ok, text)
         #
-        targetPath = os.path.join(self.__sandBoxTopPath, projectDir, relProjectPath)
+        targetPath = os.path.join(self.__getProjectPath(projectDir), relProjectPath)
 
         if os.access(targetPath, os.W_OK):
             #
             cmd = self.__getRemoveDirCommitCmd(projectDir, relProjectPath)
             if cmd is not None:
-                ok = self._runCvsCommand(myCommand=cmd)
+                self._runCvsCommand(myCommand=cmd)
+                ok = self._removePath(targetPath)
+                self.__writableProjectS.discard(projectDir)
                 text = self._getErrorText()
             else:
                 text = "Remove directory failed with repository command processing error"
@@ -589,118 +754,84 @@ class CvsSandBoxAdmin(CvsWrapperBase):
 
         return (ok, text)
 
-    def __getCheckOutProjectCmd(self, relProjectPath, revId=None):
+    def __getCheckOutProjectCmd(self, relProjectPath, revId=None, wrkPath=None):
         """Return CVS command for checkout of a complete project from the current repository."""
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
-        errPath = self._getErrorFilePath()
+        if wrkPath is None:
+            self._makeLogWorkingDir()
+        errPath = self._getErrorFilePath(wrkPath)
         if self._setCvsRoot():
-            cmd = " cd " + self.__sandBoxTopPath + " ; "
-            if revId is None:
-                cmd += "cvs -d " + self._cvsRoot + " co " + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath) + " ; "
-            else:
-                rS = " -r " + revId + " "
-                cmd += "cvs -d " + self._cvsRoot + " co " + rS + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath) + " ; "
+            rL = [] if revId is None else ["-r", revId]
+            cmd = [(["cvs", "-d", self._cvsRoot, "co"] + rL + [relProjectPath], self.__sandBoxTopPath, errPath, errPath, False)]
         else:
             cmd = None
         return cmd
 
-    # def __getUpdateProjectCmd(self, projectDir, prune=False, appendErrors=False):
-    #     """Return CVS command for updating a complete project working directory from current repository."""
-    #     if self._wrkPath is None:
-    #         self._makeTempWorkingDir()
-    #     errPath = self._getErrorFilePath()
-    #     if self._setCvsRoot():
-    #         if prune:
-    #             pF = " -P "
-    #         else:
-    #             pF = " "
-    #         targetPath = os.path.join(self.__sandBoxTopPath, projectDir)
-    #         cmd = " cd " + targetPath + "; "
-    #         cmd += "cvs -d " + self._cvsRoot + " update -C -d " + pF + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=appendErrors) + " ; "
-    #     else:
-    #         cmd = None
-    #     return cmd
-
-    def __getUpdateCmd(self, projectDir, relProjectPath, prune=False, appendErrors=False):
+    def __getUpdateCmd(self, projectDir, relProjectPath, prune=False, appendErrors=False, wrkPath=None):
         """Return CVS command for updating the input relative path within project working
         directory from current repository.
         """
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
-        errPath = self._getErrorFilePath()
+        if wrkPath is None:
+            self._makeLogWorkingDir()
+        errPath = self._getErrorFilePath(wrkPath)
         if self._setCvsRoot():
-            if prune:
-                pF = " -P "
-            else:
-                pF = " "
-            targetPath = os.path.join(self.__sandBoxTopPath, projectDir)
-            cmd = " cd " + targetPath + "; "
-            cmd += "cvs -q -d " + self._cvsRoot + " update -C -d " + pF + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=appendErrors) + " ; "
+            pL = ["-P"] if prune else []
+            targetPath = self.__getProjectPath(projectDir)
+            cmd = [(["cvs", "-q", "-d", self._cvsRoot, "update", "-C", "-d"] + pL + [relProjectPath], targetPath, errPath, errPath, appendErrors)]
         else:
             cmd = None
         return cmd
 
+    def __getMessageOpts(self, message):
+        if message is not None and len(message) > 0:
+            return ["-m", message]
+        return []
+
     def __getAddCommitCmd(self, projectDir, relProjectPath, message="Initial version"):
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
+        self._makeLogWorkingDir()
         errPath = self._getErrorFilePath()
         if self._setCvsRoot():
-            cmd = " cd " + os.path.join(self.__sandBoxTopPath, projectDir) + " ; "
-            if message is not None and len(message) > 0:
-                qm = ' -m "' + message + '" '
-            else:
-                qm = ""
-            cmd += "cvs -d " + self._cvsRoot + " add " + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath) + " ; "
-            cmd += "cvs -d " + self._cvsRoot + " commit " + qm + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True) + " ; "
+            projPath = self.__getProjectPath(projectDir)
+            cmd = [
+                (["cvs", "-d", self._cvsRoot, "add", relProjectPath], projPath, errPath, errPath, False),
+                (["cvs", "-d", self._cvsRoot, "commit"] + self.__getMessageOpts(message) + [relProjectPath], projPath, errPath, errPath, True),
+            ]
         else:
             cmd = None
         return cmd
 
     def __getCommitCmd(self, projectDir, relProjectPath, message="Automated update"):
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
+        self._makeLogWorkingDir()
         errPath = self._getErrorFilePath()
         if self._setCvsRoot():
-            cmd = " cd " + os.path.join(self.__sandBoxTopPath, projectDir) + " ; "
-            if message is not None and len(message) > 0:
-                qm = ' -m "' + message + '" '
-            else:
-                qm = ""
-            cmd += "cvs -d " + self._cvsRoot + " commit " + qm + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True) + " ; "
+            projPath = self.__getProjectPath(projectDir)
+            cmd = [(["cvs", "-d", self._cvsRoot, "commit"] + self.__getMessageOpts(message) + [relProjectPath], projPath, errPath, errPath, True)]
         else:
             cmd = None
         return cmd
 
-    def __getRemoveCommitCmd(self, projectDir, relProjectPath, message="File removed"):
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
+    def __getRemoveCommitCmd(self, projectDir, relProjectPathList, message="File removed"):
+        self._makeLogWorkingDir()
         errPath = self._getErrorFilePath()
         if self._setCvsRoot():
-            cmd = " cd " + os.path.join(self.__sandBoxTopPath, projectDir) + " ; "
-            if message is not None and len(message) > 0:
-                qm = ' -m "' + message + '" '
-            else:
-                qm = ""
-            cmd += "cvs -d " + self._cvsRoot + " remove -f " + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath) + " ; "
-            cmd += "cvs -d " + self._cvsRoot + " commit " + qm + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True) + " ; "
+            projPath = self.__getProjectPath(projectDir)
+            cmd = [
+                (["cvs", "-d", self._cvsRoot, "remove", "-f"] + relProjectPathList, projPath, errPath, errPath, False),
+                (["cvs", "-d", self._cvsRoot, "commit"] + self.__getMessageOpts(message) + relProjectPathList, projPath, errPath, errPath, True),
+            ]
         else:
             cmd = None
         return cmd
 
     def __getRemoveDirCommitCmd(self, projectDir, relProjectPath, message="Directory removed"):
-        if self._wrkPath is None:
-            self._makeTempWorkingDir()
+        """The caller removes the local directory once these steps complete."""
+        self._makeLogWorkingDir()
         errPath = self._getErrorFilePath()
         if self._setCvsRoot():
-            cmd = " cd " + os.path.join(self.__sandBoxTopPath, projectDir) + " ; "
-            if message is not None and len(message) > 0:
-                qm = ' -m "' + message + '" '
-            else:
-                qm = ""
-            cmd += "cvs -d " + self._cvsRoot + " remove " + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath) + " ; "
-            cmd += "cvs -d " + self._cvsRoot + " commit " + qm + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True) + " ; "
-            cmd += " rm -rf " + relProjectPath + self._getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True) + " ; "
+            projPath = self.__getProjectPath(projectDir)
+            cmd = [
+                (["cvs", "-d", self._cvsRoot, "remove", relProjectPath], projPath, errPath, errPath, False),
+                (["cvs", "-d", self._cvsRoot, "commit"] + self.__getMessageOpts(message) + [relProjectPath], projPath, errPath, errPath, True),
+            ]
         else:
             cmd = None
         return cmd
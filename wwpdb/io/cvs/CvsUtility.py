@@ -23,6 +23,7 @@ import subprocess
 import tempfile
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 
 class CvsWrapper(object):
@@ -43,14 +44,18 @@ class CvsWrapper(object):
         self.__wrkPath = None
         self.__cvsInfoFileName = "cvsInfo.txt"
         self.__cvsErrorFileName = "cvsError.txt"
+        self.__infoPath = None
+        self.__errPath = None
 
     def setRepositoryPath(self, host, path):
         self.__repositoryHost = host
         self.__repositoryPath = path
+        self.__setCvsRoot()
 
     def setAuthInfo(self, user, password):
         self.__cvsUser = user
         self.__cvsPassword = password
+        self.__setCvsRoot()
 
     def getHistory(self, cvsPath):
         text = ""
@@ -67,152 +72,242 @@ class CvsWrapper(object):
         Return data has the for [(RevId, A/M, timeStamp),...] where A=Added and M=Modified.
         """
         revList = []
-        cmd = self.__getHistoryCmd(cvsPath)
-        if cmd is not None:
-            _ok = self.__runCvsCommand(myCommand=cmd)  # noqa: F841
-            revList = self.__extractRevisions()
+        if self.__cvsRoot is not None:
+            # history text is parsed directly from the cvs output pipe
+            outData, _errData, _retcode = self.__runCvsCapture(["cvs", "-d", self.__cvsRoot, "history", "-a", "-x", "AM", cvsPath])
+            revList = self.__extractRevisions(outData.decode("utf-8", "replace").splitlines())
         return revList
 
     def cleanup(self):
         """Cleanup temporary files and directories"""
-        return shutil.rmtree(self.__wrkPath)
+        if self.__wrkPath is None:
+            return None
+        # rmtree already walks the tree with os.scandir() using cached entry types
+        shutil.rmtree(self.__wrkPath)
+        self.__wrkPath = self.__infoPath = self.__errPath = None
+        return None
 
     def checkOutFile(self, cvsPath, outPath, revId=None):
         text = ""
         (pth, fn) = os.path.split(cvsPath)
         self.__logger.debug("Cvs directory %s   target file name %s", pth, fn)
         if len(fn) > 0:
-            cmd = self.__getCheckOutCmd(cvsPath, outPath, revId)
+            cmd = self.__getCheckOutCmd(cvsPath, revId)
             if cmd is not None:
                 _ok = self.__runCvsCommand(myCommand=cmd)  # noqa: F841
+                self.__movePath(os.path.join(self.__wrkPath, fn), outPath)
                 text = self.__getErrorText()
         else:
             pass
         return text
 
+    def checkOutFiles(self, cvsPath, revOutList, maxWorkers=1):
+        """Check out several revisions of cvsPath.
+
+        Input is a list of tuples [(revId, outPath),...].  Each revision is fetched by its own
+        'cvs co -p' process - with maxWorkers=1 these are run in turn, otherwise up to maxWorkers
+        run concurrently.  Each revision is written to a temporary file which replaces outPath
+        only when the checkout succeeds.  Returns a list of tuples [(status, cvs diagnostic text),...]
+        for each revision in the input order.
+        """
+        statusList = []
+        (pth, fn) = os.path.split(cvsPath)
+        self.__logger.debug("Cvs directory %s   target file name %s", pth, fn)
+        if len(fn) > 0 and len(revOutList) > 0:
+            # the working directory is created here, before any worker starts, so threads share no mutable state
+            cmdList = self.__getCheckOutRevisionsCmdList(cvsPath, revOutList)
+            if cmdList is not None:
+                outPathList = [outPath for _revId, outPath in revOutList]
+                if maxWorkers > 1 and len(cmdList) > 1:
+                    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+                        okList = list(executor.map(self.__checkOutRevision, cmdList, outPathList))
+                else:
+                    okList = [self.__checkOutRevision(step, outPath) for step, outPath in zip(cmdList, outPathList)]
+                statusList = [(ok, self.__getErrorText(fileName=self.__getRevisionErrorFileName(ii))) for ii, ok in enumerate(okList)]
+        return statusList
+
+    def checkOutFileList(self, fileList):
+        """Check out a batch of files.
+
+        Input is a list of tuples [(cvsPath, outPath, revId),...] where revId may be None for the
+        latest revision.  Files are checked out with one cvs invocation per distinct revision
+        into a shared working directory and then moved to their output paths.  Returns a list of
+        the cvs diagnostic text for each file in the input order.
+        """
+        textList = []
+        if len(fileList) > 0:
+            groupList = self.__getCheckOutListCmdList(fileList)
+            if groupList is not None:
+                textList = [""] * len(fileList)
+                for cmd, errPath, indexList in groupList:
+                    _ok = self.__runCvsCommand(myCommand=cmd)  # noqa: F841
+                    # the same file may be requested more than once for a revision
+                    doneD = {}
+                    for ii in indexList:
+                        cvsPath, outPath, _revId = fileList[ii]
+                        if cvsPath in doneD:
+                            self.__copyPath(doneD[cvsPath], outPath, errPath)
+                        elif self.__movePath(os.path.join(self.__wrkPath, cvsPath), outPath, errPath=errPath):
+                            doneD[cvsPath] = outPath
+                    text = self.__getErrorText(fileName=os.path.basename(errPath))
+                    for ii in indexList:
+                        textList[ii] = text
+        return textList
+
     def __getHistoryCmd(self, cvsPath):
+        if self.__cvsRoot is None:
+            return None
         if self.__wrkPath is None:
             self.__makeTempWorkingDir()
-        outPath = os.path.join(self.__wrkPath, self.__cvsInfoFileName)
-        errPath = os.path.join(self.__wrkPath, self.__cvsErrorFileName)
-        if self.__setCvsRoot():
-            cmd = "cvs -d " + self.__cvsRoot + " history -a -x AM " + cvsPath + self.__getRedirect(fileNameOut=outPath, fileNameErr=errPath)
-        else:
-            cmd = None
-        return cmd
+        return [(["cvs", "-d", self.__cvsRoot, "history", "-a", "-x", "AM", cvsPath], None, self.__infoPath, self.__errPath, False)]
 
-    def __getCheckOutCmd(self, cvsPath, outPath, revId=None):
+    def __getCheckOutCmd(self, cvsPath, revId=None):
+        """Check out into the temporary working directory - the caller then moves the result into place."""
+        if self.__cvsRoot is None:
+            return None
         if self.__wrkPath is None:
             self.__makeTempWorkingDir()
-        errPath = os.path.join(self.__wrkPath, self.__cvsErrorFileName)
         (pth, fn) = os.path.split(cvsPath)
         self.__logger.debug("CVS directory %s  target file name %s", pth, fn)
-        lclPath = os.path.join(self.__wrkPath, fn)
         #
-        #
-        if self.__setCvsRoot():
-            if revId is None:
-                rS = " "
-                cmd = (
-                    "cvs -d "
-                    + self.__cvsRoot
-                    + " co -d "
-                    + self.__wrkPath
-                    + " "
-                    + cvsPath
-                    + self.__getRedirect(fileNameOut=errPath, fileNameErr=errPath)
-                    + " ; "
-                    + " mv -f  "
-                    + lclPath
-                    + " "
-                    + outPath
-                    + self.__getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True)
-                    + " ; "
-                )
-            else:
-                rS = " -r " + revId + " "
-                cmd = (
-                    "cvs -d "
-                    + self.__cvsRoot
-                    + " co -d "
-                    + self.__wrkPath
-                    + rS
-                    + " "
-                    + cvsPath
-                    + self.__getRedirect(fileNameOut=errPath, fileNameErr=errPath)
-                    + " ; "
-                    + " mv -f  "
-                    + lclPath
-                    + " "
-                    + outPath
-                    + self.__getRedirect(fileNameOut=errPath, fileNameErr=errPath, append=True)
-                    + " ; "
-                )
-        else:
-            cmd = None
-        return cmd
-
-    def __getRedirect(self, fileNameOut="myLog.log", fileNameErr="myLog.log", append=False):
-        if append:
-            if fileNameOut == fileNameErr:
-                oReDir = " >> " + fileNameOut + " 2>&1 "
-            else:
-                oReDir = " >> " + fileNameOut + " 2>> " + fileNameErr
-        else:
-            if fileNameOut == fileNameErr:
-                oReDir = " > " + fileNameOut + " 2>&1 "
-            else:
-                oReDir = " > " + fileNameOut + " 2> " + fileNameErr
+        rL = [] if revId is None else ["-r", revId]
+        return [(["cvs", "-d", self.__cvsRoot, "co", "-d", self.__wrkPath] + rL + [cvsPath], None, self.__errPath, self.__errPath, False)]
+
+    def __getRevisionErrorFileName(self, index):
+        return "%s-%d" % (self.__cvsErrorFileName, index)
+
+    def __getCheckOutRevisionsCmdList(self, cvsPath, revOutList):
+        """One 'co -p' per revision - file content goes to a temporary file next to the output path, so no sandbox is required."""
+        if self.__cvsRoot is None:
+            return None
+        if self.__wrkPath is None:
+            self.__makeTempWorkingDir()
+        cmdList = []
+        for ii, (revId, outPath) in enumerate(revOutList):
+            errPath = os.path.join(self.__wrkPath, self.__getRevisionErrorFileName(ii))
+            outPathAbs = os.path.abspath(outPath)
+            tmpOutPath = os.path.join(os.path.dirname(outPathAbs), ".%s.%d.%d.cvstmp" % (os.path.basename(outPathAbs), os.getpid(), ii))
+            cmdList.append((["cvs", "-d", self.__cvsRoot, "co", "-p", "-r", revId, cvsPath], None, tmpOutPath, errPath, False))
+        return cmdList
+
+    def __checkOutRevision(self, step, outPath):
+        """Run a single 'co -p' step and move its temporary output file onto outPath on success."""
+        ok = self.__runCvsCommand(myCommand=[step])
+        tmpOutPath, errPath = step[2], step[3]
+        try:
+            if ok:
+                os.replace(tmpOutPath, outPath)
+            elif os.path.exists(tmpOutPath):
+                os.remove(tmpOutPath)
+        except OSError as e:
+            self.__appendErrorText(errPath, "mv: cannot move %s to %s: %s\n" % (tmpOutPath, outPath, str(e)))
+            ok = False
+        return ok
 
-        return oReDir
+    def __getCheckOutListCmdList(self, fileList):
+        """Return a list of tuples (cmd, errPath, [file index,...]) with one 'co' command per revision,
+        each checking out the files for that revision relative to the working directory.
+        """
+        if self.__cvsRoot is None:
+            return None
+        if self.__wrkPath is None:
+            self.__makeTempWorkingDir()
+        indexD = {}
+        for ii, (_cvsPath, _outPath, revId) in enumerate(fileList):
+            indexD.setdefault(revId, []).append(ii)
+        groupList = []
+        for jj, (revId, indexList) in enumerate(indexD.items()):
+            errPath = os.path.join(self.__wrkPath, "%s-co-%d" % (self.__cvsErrorFileName, jj))
+            rL = [] if revId is None else ["-r", revId]
+            cvsPathList = list(dict.fromkeys(fileList[ii][0] for ii in indexList))
+            groupList.append(([(["cvs", "-d", self.__cvsRoot, "co"] + rL + cvsPathList, self.__wrkPath, errPath, errPath, False)], errPath, indexList))
+        return groupList
 
     def __runCvsCommand(self, myCommand):
+        """Run the command steps in myCommand in order, returning the status of the last step.
+
+        Each step is a tuple (argv, cwd, outPath, errPath, append) - standard output and error are written
+        to outPath and errPath (a single file when these are the same).
+        """
+        ok = False
+        for argv, cwd, outPath, errPath, append in myCommand:
+            ok = self.__runCommandStep(argv, cwd, outPath, errPath, append)
+        return ok
+
+    def __runCommandStep(self, argv, cwd, outPath, errPath, append):
         retcode = -100
+        mode = "ab" if append else "wb"
         try:
-            self.__logger.debug("Command: %s", myCommand)
+            self.__logger.debug("Command: %s", " ".join(argv))
 
-            # if (self.__debug):
-            #    self.__lfh.write("+CvsWrapper(__runCvsCommand) command: %s\n" % myCommand)
-
-            retcode = subprocess.call(myCommand, shell=True)
+            with open(outPath, mode) as ofh:
+                if errPath == outPath:
+                    retcode = subprocess.call(argv, cwd=cwd, stdout=ofh, stderr=subprocess.STDOUT)
+                else:
+                    with open(errPath, mode) as efh:
+                        retcode = subprocess.call(argv, cwd=cwd, stdout=ofh, stderr=efh)
             if retcode < 0:
-                self.__logger.debug("Child was terminated by signal %r", retcode)
-                # if self.__verbose:
-                #    self.__lfh.write("+CvsWrapper(__runCvsCommand) Child was terminated by signal %r\n" % retcode)
-                return False
-            else:
-                self.__logger.debug("Child was terminated by signal %r", retcode)
-                # if self.__verbose:
-                #    self.__lfh.write("+CvsWrapper(__runCvsCommand) Child was terminated by signal %r\n" % retcode)
-                return True
+                self.__logger.debug("Child was terminated by signal %r", -retcode)
+            elif retcode > 0:
+                self.__logger.debug("Child exited with status %r", retcode)
+            return retcode == 0
         except OSError as e:
             self.__logger.exception("cvs command exception: %r %r", retcode, str(e))
-            # if self.__verbose:
-            #    self.__lfh.write("+CvsWrapper(__runCvsCommand) Execution failed: %r\n" % e)
             return False
 
-    def __setCvsRoot(self):
+    def __copyPath(self, srcPath, dstPath, errPath):
         try:
-            self.__cvsRoot = ":pserver:" + self.__cvsUser + ":" + self.__cvsPassword + "@" + self.__repositoryHost + ":" + self.__repositoryPath
+            shutil.copyfile(srcPath, dstPath)
             return True
-        except:  # noqa: E722 pylint: disable=bare-except
+        except OSError as e:
+            self.__appendErrorText(errPath, "cp: cannot copy %s to %s: %s\n" % (srcPath, dstPath, str(e)))
             return False
 
-    def __extractRevisions(self):
-        """Extract revisions details from the last history command."""
-        revList = []
+    def __runCvsCapture(self, argv):
+        """Run argv returning its captured (stdout bytes, stderr bytes, return code)."""
         try:
-            fName = os.path.join(self.__wrkPath, self.__cvsInfoFileName)
-            self.__logger.debug("Reading revisions from %r", fName)
-            ifh = open(fName, "r")
-            for line in ifh.readlines():
-                fields = line[:-1].split()
-                typeCode = str(fields[0])
-                revId = str(fields[5])
-                timeStamp = str(fields[1] + ":" + fields[2])
-                revList.append((revId, typeCode, timeStamp))
-        except:  # noqa: E722 pylint: disable=bare-except
-            self.__logger.exception("Extracting revision list for : %s", fName)
+            self.__logger.debug("Command: %s", " ".join(argv))
+            proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            outData, errData = proc.communicate()
+            return outData, errData, proc.returncode
+        except OSError as e:
+            self.__logger.exception("cvs command exception: %r", str(e))
+            return b"", str(e).encode("utf-8"), -100
+
+    def __movePath(self, srcPath, dstPath, errPath=None):
+        """Move srcPath to dstPath with the semantics of 'mv -f', appending any failure to the error file."""
+        try:
+            shutil.move(srcPath, dstPath)
+            return True
+        except (OSError, shutil.Error) as e:
+            if errPath is None:
+                errPath = self.__errPath
+            self.__appendErrorText(errPath, "mv: cannot move %s to %s: %s\n" % (srcPath, dstPath, str(e)))
+            return False
+
+    def __appendErrorText(self, errPath, text):
+        try:
+            with open(errPath, "a") as ofh:
+                ofh.write(text)
+        except OSError:
+            pass
+
+    def __setCvsRoot(self):
+        """Assemble the CVS root once both the repository and authentication details are set."""
+        if None in (self.__cvsUser, self.__cvsPassword, self.__repositoryHost, self.__repositoryPath):
+            self.__cvsRoot = None
+        else:
+            self.__cvsRoot = ":pserver:" + self.__cvsUser + ":" + self.__cvsPassword + "@" + self.__repositoryHost + ":" + self.__repositoryPath
+
+    def __extractRevisions(self, lineList):
+        """Extract revisions details from the lines of history command output."""
+        revList = []
+        for line in lineList:
+            # only the leading six fields are used - lines with fewer are not revision records
+            fields = line.split(None, 6)
+            if len(fields) < 6:
+                continue
+            revList.append((fields[5], fields[0], fields[1] + ":" + fields[2]))
 
         revList.reverse()
         self.__logger.debug("Ordered revision list %r", revList)
@@ -221,21 +316,21 @@ class CvsWrapper(object):
 
     def __getOutputText(self):
         text = ""
+        fPath = self.__infoPath
         try:
-            fPath = os.path.join(self.__wrkPath, self.__cvsInfoFileName)
-            ifh = open(fPath, "r")
-            text = ifh.read()
+            with open(fPath, "rb") as ifh:
+                text = ifh.read().decode("utf-8", "replace")
         except:  # noqa: E722 pylint: disable=bare-except
             self.__logger.exception("Execption reading cvs output file: %s", fPath)
 
         return text
 
-    def __getErrorText(self):
+    def __getErrorText(self, fileName=None):
         text = ""
         try:
-            fName = os.path.join(self.__wrkPath, self.__cvsErrorFileName)
-            ifh = open(fName, "r")
-            text = ifh.read()
+            fName = self.__errPath if fileName is None else os.path.join(self.__wrkPath, fileName)
+            with open(fName, "rb") as ifh:
+                text = ifh.read().decode("utf-8", "replace")
         except:  # noqa: E722 pylint: disable=bare-except
             pass
 
@@ -246,4 +341,6 @@ class CvsWrapper(object):
             self.__wrkPath = tempfile.mkdtemp("tmpdir", "rcsbCVS", self.__tmpPath)
         else:
             self.__wrkPath = tempfile.mkdtemp("tmpdir", "rcsbCVS")
+        self.__infoPath = os.path.join(self.__wrkPath, self.__cvsInfoFileName)
+        self.__errPath = os.path.join(self.__wrkPath, self.__cvsErrorFileName)
         self.__logger.debug("Working directory path set to  %r", self.__wrkPath)
@@ -31,10 +31,12 @@ import os.path
 import time
 import datetime
 import filecmp
+import mmap
 import stat
 import shutil
 import smtplib
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 
 ##
@@ -240,6 +242,33 @@ class DataFile:
             cmd = cmdP1 + cmdP2
             return os.system(cmd)
 
+    def __cmpFiles(self, f1, f2):
+        """Internal method returning True if files f1 and f2 have identical content.
+
+        Files of differing size are rejected from their stat.  Larger files are compared
+        through read-only memory maps in 1 MiB slices (memcmp), small files with filecmp.
+        """
+        size1 = os.path.getsize(f1)
+        if size1 != os.path.getsize(f2):
+            return False
+        if size1 < 4096:
+            return filecmp.cmp(f1, f2, False)
+
+        chunk = 1 << 20
+        with open(f1, "rb") as fa, open(f2, "rb") as fb:
+            ma = mmap.mmap(fa.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                mb = mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    for offset in range(0, size1, chunk):
+                        if ma[offset : offset + chunk] != mb[offset : offset + chunk]:
+                            return False
+                    return True
+                finally:
+                    mb.close()
+            finally:
+                ma.close()
+
     def __compare(self):
         """Compare srcPath to dstPath converting compression according to
            file extension (.Z, .gz, .bz ).
@@ -255,7 +284,7 @@ class DataFile:
             return isSame
 
         if self.srcType == self.dstType:
-            isSame = filecmp.cmp(self.srcPath, self.dstPath, False)
+            isSame = self.__cmpFiles(self.srcPath, self.dstPath)
         else:
             cmd = ""
             if self.srcType is None:
@@ -286,7 +315,7 @@ class DataFile:
                 os.system(cmd)
 
             if os.access(f1, os.F_OK) and os.access(f2, os.F_OK):
-                isSame = filecmp.cmp(f1, f2, False)
+                isSame = self.__cmpFiles(f1, f2)
                 if f1 != self.srcPath:
                     os.remove(f1)
                 if f2 != self.dstPath:
@@ -428,6 +457,43 @@ class DataFile:
         self.__copy(op="copy")
         self.__setDstTimeStamp()
 
+    def copyMany(self, dstPathList):
+        """Copies srcPath to each path in dstPathList converting compression mode
+        according to file type.
+
+        Destinations of the same file type are copied concurrently, each with shutil.copy2();
+        the others are converted one at a time as by copy().  Repeated destinations are
+        copied once, and shutil.SameFileError is raised before any copy is made if a
+        destination is the source file itself.  On return the destination is the last
+        path in dstPathList.
+        """
+        if not self.srcFileExists() or not dstPathList:
+            return
+        dstPathList = list(dict.fromkeys(os.path.abspath(dstPath) for dstPath in dstPathList))
+        for dstPath in dstPathList:
+            if os.path.exists(dstPath) and os.path.samefile(self.srcPath, dstPath):
+                raise shutil.SameFileError("{!r} and {!r} are the same file".format(self.srcPath, dstPath))
+        sameTypeList = []
+        for dstPath in dstPathList:
+            self.dst(dstPath)
+            if self.srcType == self.dstType:
+                if not self.dstDirExists():
+                    self.__mkdir(self.dstDirName)
+                sameTypeList.append(self.dstPath)
+            else:
+                self.__copy(op="copy")
+                self.__setDstTimeStamp()
+
+        if sameTypeList:
+            with ThreadPoolExecutor(max_workers=len(sameTypeList)) as executor:
+                list(executor.map(lambda dstPath: shutil.copy2(self.srcPath, dstPath), sameTypeList))
+
+            for dstPath in sameTypeList:
+                self.dst(dstPath)
+                self.__setDstTimeStamp()
+
+        self.dst(dstPathList[-1])
+
     def append(self, dstPath=None):
         """Appends srcPath to dstPath converting compression mode
         according to file type.
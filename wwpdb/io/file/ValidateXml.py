@@ -21,7 +21,7 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
-from xml.dom import minidom
+from xml.etree import ElementTree
 import sys
 import traceback
 
@@ -31,7 +31,6 @@ class ValidateXml(object):
 
     def __init__(self, FileName=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
         self.__xmlFile = FileName
-        self.__doc = minidom.parse(self.__xmlFile)
         #
         self.clashMap = {}
         self.clashOutliers = []
@@ -106,145 +105,165 @@ class ValidateXml(object):
         self.__outlierMap["clash"] = ["atom", "cid", "clashmag", "dist"]
 
     def __parse(self):
-        """"""
-        self.__processGlobalValues()
+        """Single streaming pass over the report - each element of interest is processed once
+        complete and then detached from its parent, as is every other complete child of the root,
+        so the parsed tree never grows with the size of the document.
+        """
+        entryFound = False
+        pathL = []
+        for event, node in ElementTree.iterparse(self.__xmlFile, events=("start", "end")):
+            if event == "start":
+                pathL.append(node)
+                continue
+            pathL.pop()
+            handled = True
+            if node.tag == "ModelledSubgroup":
+                self.__processModelledSubgroup(node)
+            elif node.tag == "ModelledEntityInstance":
+                self.__processModelledEntityInstance(node)
+            elif node.tag == "chemical_shift_list":
+                self.__processChemcalShiftList(node)
+            elif node.tag == "Entry" and not entryFound:
+                self.__processGlobalValues(node)
+                entryFound = True
+            else:
+                handled = False
+            if pathL and (handled or len(pathL) == 1):
+                pathL[-1].remove(node)
         #
-        self.__processChemcalShiftList()
+        if not entryFound:
+            raise ValueError("No Entry element in validation report %s" % self.__xmlFile)
         #
+        self.__processClashes()
+
+    def __processModelledSubgroup(self, node):
+        """"""
         items = ["model", "ent", "chain", "resname", "resnum", "icode"]  # , 'ligand_geometry_outlier', 'ligand_density_outlier' ]
         #
-        for node in self.__doc.getElementsByTagName("ModelledSubgroup"):
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
-            #
-            residueInfo = {}
-            if node.hasAttribute("rama"):
-                val = node.getAttribute("rama").strip()
-                if val == "OUTLIER":
-                    if not residueInfo:
-                        residueInfo = self.__getMapInfo(node, items)
-                    #
-                    dirmap = self.__getMapInfo(node, self.__outlierMap["torsion-outlier"])
-                    outlier = residueInfo.copy()
-                    outlier.update(dirmap)
-                    if "torsion-outlier" in self.__outlierResult:
-                        self.__outlierResult["torsion-outlier"].append(outlier)
-                    else:
-                        listout = []
-                        listout.append(outlier)
-                        self.__outlierResult["torsion-outlier"] = listout
-                    #
-                #
-            #
-            if node.hasAttribute("rsrz"):
-                val = node.getAttribute("rsrz").strip()
-                if float(val) > 5:
-                    if not residueInfo:
-                        residueInfo = self.__getMapInfo(node, items)
-                    #
-                    outlier = residueInfo.copy()
-                    outlier["rsrz"] = val
-                    if "polymer-rsrz-outlier" in self.__outlierResult:
-                        self.__outlierResult["polymer-rsrz-outlier"].append(outlier)
-                    else:
-                        listout = []
-                        listout.append(outlier)
-                        self.__outlierResult["polymer-rsrz-outlier"] = listout
-                    #
+        residueInfo = {}
+        if "rama" in node.attrib:
+            val = node.get("rama", "").strip()
+            if val == "OUTLIER":
+                if not residueInfo:
+                    residueInfo = self.__getMapInfo(node, items)
                 #
-            #
-            if node.hasAttribute("ligRSRZ"):
-                val = node.getAttribute("ligRSRZ").strip()
-                if float(val) > 5:
-                    if not residueInfo:
-                        residueInfo = self.__getMapInfo(node, items)
-                    #
-                    outlier = residueInfo.copy()
-                    outlier["ligRSRZ"] = val
-                    if "ligand-rsrz-outlier" in self.__outlierResult:
-                        self.__outlierResult["ligand-rsrz-outlier"].append(outlier)
-                    else:
-                        listout = []
-                        listout.append(outlier)
-                        self.__outlierResult["ligand-rsrz-outlier"] = listout
-                    #
+                dirmap = self.__getMapInfo(node, self.__outlierMap["torsion-outlier"])
+                outlier = residueInfo.copy()
+                outlier.update(dirmap)
+                if "torsion-outlier" in self.__outlierResult:
+                    self.__outlierResult["torsion-outlier"].append(outlier)
+                else:
+                    listout = []
+                    listout.append(outlier)
+                    self.__outlierResult["torsion-outlier"] = listout
                 #
             #
-
-            for childnode in node.childNodes:
-                if childnode.nodeType != node.ELEMENT_NODE:
-                    continue
-                #
-                if childnode.tagName not in self.__outlierMap:
-                    continue
-                #
+        #
+        if "rsrz" in node.attrib:
+            val = node.get("rsrz", "").strip()
+            if float(val) > 5:
                 if not residueInfo:
                     residueInfo = self.__getMapInfo(node, items)
                 #
-                dirmap = self.__getMapInfo(childnode, self.__outlierMap[childnode.tagName])
-                # jmb - removed cut off in reporting outliers in standard bond lengths and bond angles. Uses validation XML cut off instead.
-                # if childnode.tagName == 'bond-outlier' or childnode.tagName == 'angle-outlier':
-                #    if abs(float(dirmap['z'])) <= 10:
-                #        continue
+                outlier = residueInfo.copy()
+                outlier["rsrz"] = val
+                if "polymer-rsrz-outlier" in self.__outlierResult:
+                    self.__outlierResult["polymer-rsrz-outlier"].append(outlier)
+                else:
+                    listout = []
+                    listout.append(outlier)
+                    self.__outlierResult["polymer-rsrz-outlier"] = listout
                 #
-                # skip bonds between standard residues in reporting,
-                # these are better captured in pdbx_validate_polymer_linkage
-                # - the validation is limited to a maxiumum distance
-                # of 1.999 Angstroms in the validation report for unusual bonds
-                if childnode.tagName == "bond-outlier":
-                    if dirmap["atom0"] in ("C", "O3'") and dirmap["atom1"] in ("N", "P"):
-                        continue
-
-                if childnode.tagName == "mog-angle-outlier" or childnode.tagName == "mog-bond-outlier":
-                    if abs(float(dirmap["Zscore"])) <= 10:
-                        continue
-                    #
+            #
+        #
+        if "ligRSRZ" in node.attrib:
+            val = node.get("ligRSRZ", "").strip()
+            if float(val) > 5:
+                if not residueInfo:
+                    residueInfo = self.__getMapInfo(node, items)
                 #
-                if childnode.tagName == "clash":
-                    atom_dict = {
-                        "dist": dirmap["dist"],
-                        "atom": dirmap["atom"],
-                        "clashmag": dirmap["clashmag"],
-                        "chain": node.getAttribute("chain").strip(),
-                        "model": node.getAttribute("model").strip(),
-                        "altcode": node.getAttribute("altcode").strip(),
-                        "resnum": node.getAttribute("resnum").strip(),
-                        "resname": node.getAttribute("resname").strip(),
-                    }
-                    if float(dirmap["dist"]) < 2.2:
-                        self.clashMap.setdefault(dirmap["cid"], []).append(atom_dict)
-
                 outlier = residueInfo.copy()
-                outlier.update(dirmap)
-                if childnode.tagName in self.__outlierResult:
-                    self.__outlierResult[childnode.tagName].append(outlier)
+                outlier["ligRSRZ"] = val
+                if "ligand-rsrz-outlier" in self.__outlierResult:
+                    self.__outlierResult["ligand-rsrz-outlier"].append(outlier)
                 else:
                     listout = []
                     listout.append(outlier)
-                    self.__outlierResult[childnode.tagName] = listout
+                    self.__outlierResult["ligand-rsrz-outlier"] = listout
                 #
             #
         #
 
-        for node in self.__doc.getElementsByTagName("ModelledEntityInstance"):
-            if node.nodeType != node.ELEMENT_NODE:
+        for childnode in node:
+            if childnode.tag not in self.__outlierMap:
                 continue
+            #
+            if not residueInfo:
+                residueInfo = self.__getMapInfo(node, items)
+            #
+            dirmap = self.__getMapInfo(childnode, self.__outlierMap[childnode.tag])
+            # jmb - removed cut off in reporting outliers in standard bond lengths and bond angles. Uses validation XML cut off instead.
+            # if childnode.tag == 'bond-outlier' or childnode.tag == 'angle-outlier':
+            #    if abs(float(dirmap['z'])) <= 10:
+            #        continue
+            #
+            # skip bonds between standard residues in reporting,
+            # these are better captured in pdbx_validate_polymer_linkage
+            # - the validation is limited to a maxiumum distance
+            # of 1.999 Angstroms in the validation report for unusual bonds
+            if childnode.tag == "bond-outlier":
+                if dirmap["atom0"] in ("C", "O3'") and dirmap["atom1"] in ("N", "P"):
+                    continue
 
-            if node.hasAttribute("average_residue_inclusion"):
-                try:
-                    if float(node.getAttribute("average_residue_inclusion").strip()) < 0.1:
-                        if "chain_average_residue_inclusion" not in self.__outlierResult:
-                            self.__outlierResult["chain_average_residue_inclusion"] = []
-                        self.__outlierResult["chain_average_residue_inclusion"].append(
-                            {
-                                "chain": node.getAttribute("chain").strip(),
-                                "model": node.getAttribute("model").strip(),
-                                "average_residue_inclusion": float(node.getAttribute("average_residue_inclusion").strip()) * 100,
-                            }
-                        )
-                except ValueError:
-                    pass
+            if childnode.tag == "mog-angle-outlier" or childnode.tag == "mog-bond-outlier":
+                if abs(float(dirmap["Zscore"])) <= 10:
+                    continue
+                #
+            #
+            if childnode.tag == "clash":
+                atom_dict = {
+                    "dist": dirmap["dist"],
+                    "atom": dirmap["atom"],
+                    "clashmag": dirmap["clashmag"],
+                    "chain": node.get("chain", "").strip(),
+                    "model": node.get("model", "").strip(),
+                    "altcode": node.get("altcode", "").strip(),
+                    "resnum": node.get("resnum", "").strip(),
+                    "resname": node.get("resname", "").strip(),
+                }
+                if float(dirmap["dist"]) < 2.2:
+                    self.clashMap.setdefault(dirmap["cid"], []).append(atom_dict)
+
+            outlier = residueInfo.copy()
+            outlier.update(dirmap)
+            if childnode.tag in self.__outlierResult:
+                self.__outlierResult[childnode.tag].append(outlier)
+            else:
+                listout = []
+                listout.append(outlier)
+                self.__outlierResult[childnode.tag] = listout
+            #
+        #
 
+    def __processModelledEntityInstance(self, node):
+        """"""
+        if "average_residue_inclusion" in node.attrib:
+            try:
+                if float(node.get("average_residue_inclusion", "").strip()) < 0.1:
+                    if "chain_average_residue_inclusion" not in self.__outlierResult:
+                        self.__outlierResult["chain_average_residue_inclusion"] = []
+                    self.__outlierResult["chain_average_residue_inclusion"].append(
+                        {
+                            "chain": node.get("chain", "").strip(),
+                            "model": node.get("model", "").strip(),
+                            "average_residue_inclusion": float(node.get("average_residue_inclusion", "").strip()) * 100,
+                        }
+                    )
+            except ValueError:
+                pass
+
+    def __processClashes(self):
+        """Pair the atoms of each close contact collected while reading the subgroups"""
         if self.clashMap:
             for o in self.clashMap:
                 # check that there are two clashes
@@ -271,9 +290,8 @@ class ValidateXml(object):
                     #
                 #
             #
-        #
 
-    def __getSummaryValues(self):
+    def __getSummaryValues(self, Entry):
         summaryList = [
             "DCC_Rfree",
             "clashscore",
@@ -284,31 +302,29 @@ class ValidateXml(object):
             "contour_level_primary_map",
         ]
 
-        Entry = self.__doc.getElementsByTagName("Entry")[0]
         for item in summaryList:
-            if Entry.getAttribute(item) and Entry.getAttribute(item) != "NotAvailable":
+            if Entry.get(item, "") and Entry.get(item, "") != "NotAvailable":
                 try:
-                    self.summaryValues[item] = float(Entry.getAttribute(item))
+                    self.summaryValues[item] = float(Entry.get(item, ""))
                 except:  # noqa: E722 pylint: disable=bare-except
                     pass
 
-    def __processGlobalValues(self):
+    def __processGlobalValues(self, Entry):
         """"""
-        self.__getSummaryValues()
+        self.__getSummaryValues(Entry)
         global_values = {}
-        Entry = self.__doc.getElementsByTagName("Entry")[0]
         for item in ("DCC_Rfree", "PDB-Rfree", "DCC_R", "PDB-R"):
-            if Entry.getAttribute(item) and Entry.getAttribute(item) != "NotAvailable":
-                global_values[item] = Entry.getAttribute(item)
+            if Entry.get(item, "") and Entry.get(item, "") != "NotAvailable":
+                global_values[item] = Entry.get(item, "")
             #
         for item in ("atom_inclusion_all_atoms", "atom_inclusion_backbone"):
-            if Entry.getAttribute(item) and Entry.getAttribute(item) != "NotAvailable":
-                value = Entry.getAttribute(item)
+            if Entry.get(item, "") and Entry.get(item, "") != "NotAvailable":
+                value = Entry.get(item, "")
                 if float(value) < 0.4:
                     self.__outlierResult[item] = value
         #
-        if Entry.getAttribute("DataCompleteness") and Entry.getAttribute("DataCompleteness") != "NotAvailable":
-            self.__calculated_completeness = Entry.getAttribute("DataCompleteness")
+        if Entry.get("DataCompleteness", "") and Entry.get("DataCompleteness", "") != "NotAvailable":
+            self.__calculated_completeness = Entry.get("DataCompleteness", "")
         #
         for global_list in (("r_free_diff", "DCC_Rfree", "PDB-Rfree"), ("r_work_diff", "DCC_R", "PDB-R")):
             if (global_list[1] in global_values) and (global_list[2] in global_values):
@@ -322,7 +338,7 @@ class ValidateXml(object):
             #
         #
 
-    def __processChemcalShiftList(self):
+    def __processChemcalShiftList(self, csNode):
         """ chemical_shift_list.attributes = ( 'block_name', 'file_id', 'file_name', 'list_id', 'number_of_errors_while_mapping', 'number_of_mapped_shifts' \
                         'number_of_parsed_shifts', 'number_of_unparsed_shifts', 'number_of_warnings_while_mapping', 'total_number_of_shifts' )
 
@@ -332,76 +348,70 @@ class ValidateXml(object):
 
             referencing_offset.attributes = ( 'atom', 'number_of_measurements', 'precision', 'uncertainty', 'value' )
         """
-        csList = self.__doc.getElementsByTagName("chemical_shift_list")
-        if len(csList) < 1:
-            return
+        if csNode.get("number_of_errors_while_mapping"):
+            self.__number_of_errors_while_mapping += int(csNode.get("number_of_errors_while_mapping"))
         #
-        for csNode in csList:
-            if csNode.getAttribute("number_of_errors_while_mapping"):
-                self.__number_of_errors_while_mapping += int(csNode.getAttribute("number_of_errors_while_mapping"))
-            #
-            if csNode.getAttribute("number_of_warnings_while_mapping"):
-                self.__number_of_warnings_while_mapping += int(csNode.getAttribute("number_of_warnings_while_mapping"))
-            #
-            unmappedCsList = csNode.getElementsByTagName("unmapped_chemical_shift")
-            if len(unmappedCsList) > 0:
-                for unmappedNode in unmappedCsList:
-                    notMappedCsResidueFlag = False
-                    if unmappedNode.getAttribute("diagnostic").startswith("Residue not found in structure."):
-                        notMappedCsResidueFlag = True
-                    #
-                    csData = []
-                    for attribute in ("chain", "resnum", "rescode", "atom", "value", "error", "ambiguity"):
-                        if unmappedNode.getAttribute(attribute):
-                            csData.append(unmappedNode.getAttribute(attribute))
-                        else:
-                            csData.append("")
-                        #
-                    #
-                    self.__not_found_in_structure_cs_list.append(csData)
-                    if notMappedCsResidueFlag:
-                        self.__not_found_residue_in_structure_cs_list.append(csData)
+        if csNode.get("number_of_warnings_while_mapping"):
+            self.__number_of_warnings_while_mapping += int(csNode.get("number_of_warnings_while_mapping"))
+        #
+        unmappedCsList = csNode.findall(".//unmapped_chemical_shift")
+        if len(unmappedCsList) > 0:
+            for unmappedNode in unmappedCsList:
+                notMappedCsResidueFlag = False
+                if unmappedNode.get("diagnostic", "").startswith("Residue not found in structure."):
+                    notMappedCsResidueFlag = True
+                #
+                csData = []
+                for attribute in ("chain", "resnum", "rescode", "atom", "value", "error", "ambiguity"):
+                    if unmappedNode.get(attribute):
+                        csData.append(unmappedNode.get(attribute, ""))
+                    else:
+                        csData.append("")
                     #
                 #
+                self.__not_found_in_structure_cs_list.append(csData)
+                if notMappedCsResidueFlag:
+                    self.__not_found_residue_in_structure_cs_list.append(csData)
+                #
             #
-            csOutlierList = csNode.getElementsByTagName("chemical_shift_outlier")
-            if len(csOutlierList) > 0:
-                for outlierNode in csOutlierList:
-                    csData = []
-                    for attribute in ("chain", "resnum", "rescode", "atom", "value", "prediction", "zscore"):
-                        if outlierNode.getAttribute(attribute):
-                            csData.append(outlierNode.getAttribute(attribute))
-                        else:
-                            csData.append("")
-                        #
+        #
+        csOutlierList = csNode.findall(".//chemical_shift_outlier")
+        if len(csOutlierList) > 0:
+            for outlierNode in csOutlierList:
+                csData = []
+                for attribute in ("chain", "resnum", "rescode", "atom", "value", "prediction", "zscore"):
+                    if outlierNode.get(attribute):
+                        csData.append(outlierNode.get(attribute, ""))
+                    else:
+                        csData.append("")
                     #
-                    self.__cs_outlier_list.append(csData)
                 #
+                self.__cs_outlier_list.append(csData)
             #
-            offsetList = csNode.getElementsByTagName("referencing_offset")
-            if len(offsetList) > 0:
-                for offsetNode in offsetList:
-                    csData = []
-                    for attribute in ("atom", "number_of_measurements", "precision", "uncertainty", "value"):
-                        if offsetNode.getAttribute(attribute):
-                            csData.append(offsetNode.getAttribute(attribute))
-                        else:
-                            csData.append("")
-                        #
+        #
+        offsetList = csNode.findall(".//referencing_offset")
+        if len(offsetList) > 0:
+            for offsetNode in offsetList:
+                csData = []
+                for attribute in ("atom", "number_of_measurements", "precision", "uncertainty", "value"):
+                    if offsetNode.get(attribute):
+                        csData.append(offsetNode.get(attribute, ""))
+                    else:
+                        csData.append("")
                     #
-                    if csData[2] and csData[3] and csData[4]:
-                        # precision = float(csData[2])
-                        uncertainty = float(csData[3])
-                        value = float(csData[4])
-                        # if (value - precision) < uncertainty:
-                        # for D_8000210797
-                        if abs(value) < uncertainty:
-                            continue
-                        #
-                        self.__has_cs_referencing_offset_flag = True
+                #
+                if csData[2] and csData[3] and csData[4]:
+                    # precision = float(csData[2])
+                    uncertainty = float(csData[3])
+                    value = float(csData[4])
+                    # if (value - precision) < uncertainty:
+                    # for D_8000210797
+                    if abs(value) < uncertainty:
+                        continue
                     #
-                    self.__cs_referencing_offset_list.append(csData)
+                    self.__has_cs_referencing_offset_flag = True
                 #
+                self.__cs_referencing_offset_list.append(csData)
             #
         #
 
@@ -410,8 +420,8 @@ class ValidateXml(object):
         mapping = {}
         for item in items:
             val = ""
-            if node.hasAttribute(item):
-                val = node.getAttribute(item).strip()
+            if item in node.attrib:
+                val = node.attrib[item].strip()
             #
             mapping[item] = val
         #
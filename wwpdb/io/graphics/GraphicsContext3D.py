@@ -19,11 +19,56 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.01"
 
 
+import os
 import sys
 import traceback
+import types
 
 from mmcif_utils.persist.PdbxPersist import PdbxPersist
 
+# File names a shelve store may occupy depending on the dbm flavour (gdbm, ndbm, dumbdbm)
+_STORE_SUFFIXES = ("", ".db", ".dat", ".dir", ".pag")
+
+
+def _storeSignature(persistFilePath):
+    sigL = []
+    for suffix in _STORE_SUFFIXES:
+        try:
+            st = os.stat(persistFilePath + suffix)
+        except OSError:
+            continue
+        sigL.append((suffix, st.st_mtime_ns, st.st_size))
+    return tuple(sigL)
+
+
+# Store path -> (signature, index view), for the most recently read stores
+_persistIndexCache = {}
+_PERSIST_INDEX_CACHE_SIZE = 32
+
+
+def _indexView(indexD):
+    return types.MappingProxyType({k: tuple(v) for k, v in indexD.items()})
+
+
+def getPersistIndex(persistFilePath, verbose=False, log=sys.stderr):
+    """Return a read-only view of the index of the persistent store, re-reading it only when the store files change.
+
+    Reading the index takes the store lock and opens the shelve, which is about half the cost of fetching
+    the first object from a small store, so repeated lookups against an unchanged store are served from memory.
+    """
+    signature = _storeSignature(persistFilePath)
+    cached = _persistIndexCache.get(persistFilePath)
+    if signature and cached is not None and cached[0] == signature:
+        return cached[1]
+    indexView = _indexView(PdbxPersist(verbose, log).getIndex(dbFileName=persistFilePath))
+    if signature:
+        # a rewritten store yields a new signature and replaces the stale entry
+        _persistIndexCache.pop(persistFilePath, None)
+        if len(_persistIndexCache) >= _PERSIST_INDEX_CACHE_SIZE:
+            _persistIndexCache.pop(next(iter(_persistIndexCache)), None)
+        _persistIndexCache[persistFilePath] = (signature, indexView)
+    return indexView
+
 
 class GraphicsContext3D(object):
     """Construct a 3D graphics context from selected rows in PDBx/mmCIF data catagories.
@@ -434,7 +479,7 @@ class GraphicsContext3D(object):
         #
         try:
             myPersist = PdbxPersist(self.__verbose, self.__lfh)
-            indexD = myPersist.getIndex(dbFileName=persistFilePath)
+            indexD = getPersistIndex(persistFilePath, verbose=self.__verbose, log=self.__lfh)
             (firstContainerName, _type) = indexD["__containers__"][0]
 
             if self.__debug:
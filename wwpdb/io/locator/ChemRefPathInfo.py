@@ -20,12 +20,20 @@ import os.path
 
 import os
 import sys
+import functools
 
 
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def _ccdHash(idCode):
+    # Pure function of the id code - cached since it is invoked per component over large collections
+    id_u = idCode.upper()
+    return id_u[-2:] if len(id_u) > 3 else id_u[0]
+
+
 class ChemRefPathInfo(object):
     """Common methods for finding path information for chemical reference data files."""
 
@@ -81,15 +89,7 @@ class ChemRefPathInfo(object):
         if not idCode:
             return None
 
-        if len(idCode) > 3:
-            hash_key = idCode.upper()[-2:]
-        else:
-            if len(idCode) > 0:
-                hash_key = idCode.upper()[0]
-            else:
-                hash_key = ""
-
-        return hash_key
+        return _ccdHash(idCode)
 
     def getFilePath(self, idCode, id_type=None):
         """Return the repository file path corresponding to the input reference data id code
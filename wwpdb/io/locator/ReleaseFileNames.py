@@ -13,6 +13,8 @@ In general the methods take accession and for_release flags.  for_release indica
 
 """
 
+_FNAME_CACHE_SIZE = 4096
+
 
 class ReleaseFileNames:
     def __init__(self):
@@ -44,6 +46,9 @@ class ReleaseFileNames:
             "emdfsc": ["underscore", "underscore"],
         }
 
+        # Names are a pure function of (content, accession, for_release) - release loops ask for the same ones repeatedly
+        self.__fnameCache = {}
+
     @staticmethod
     def __get_emdb_number(accession):
         """gets the EMDB number from the accession"""
@@ -100,50 +105,59 @@ class ReleaseFileNames:
 
         return fname
 
+    def __cachedfname(self, content, accession, for_release):
+        key = (content, accession, for_release)
+        fname = self.__fnameCache.get(key)
+        if fname is None:
+            if len(self.__fnameCache) >= _FNAME_CACHE_SIZE:
+                self.__fnameCache.clear()
+            fname = self.__fnameCache[key] = self.__getfname(content, accession, for_release)
+        return fname
+
     def get_model(self, accession, for_release=False):
-        return self.__getfname("model", accession, for_release)
+        return self.__cachedfname("model", accession, for_release)
 
     def get_structure_factor(self, accession, for_release=False):
-        return self.__getfname("sf", accession, for_release)
+        return self.__cachedfname("sf", accession, for_release)
 
     def get_chemical_shifts(self, accession, for_release=False):
-        return self.__getfname("cs", accession, for_release)
+        return self.__cachedfname("cs", accession, for_release)
 
     def get_emdb_xml(self, accession, for_release=False):
-        return self.__getfname("emdxml", accession, for_release)
+        return self.__cachedfname("emdxml", accession, for_release)
 
     def get_emdb_map(self, accession, for_release=False):
-        return self.__getfname("emdmap", accession, for_release)
+        return self.__cachedfname("emdmap", accession, for_release)
 
     def get_emdb_fsc(self, accession, for_release=False):
-        return self.__getfname("emdfsc", accession, for_release)
+        return self.__cachedfname("emdfsc", accession, for_release)
 
     def get_validation_pdf(self, accession, for_release=False):
-        return self.__getfname("validpdf", accession, for_release)
+        return self.__cachedfname("validpdf", accession, for_release)
 
     def get_validation_full_pdf(self, accession, for_release=False):
-        return self.__getfname("validpdffull", accession, for_release)
+        return self.__cachedfname("validpdffull", accession, for_release)
 
     def get_validation_xml(self, accession, for_release=False):
-        return self.__getfname("validxml", accession, for_release)
+        return self.__cachedfname("validxml", accession, for_release)
 
     def get_validation_cif(self, accession, for_release=False):
-        return self.__getfname("validcif", accession, for_release)
+        return self.__cachedfname("validcif", accession, for_release)
 
     def get_validation_png(self, accession, for_release=False):
-        return self.__getfname("validpng", accession, for_release)
+        return self.__cachedfname("validpng", accession, for_release)
 
     def get_validation_svg(self, accession, for_release=False):
-        return self.__getfname("validsvg", accession, for_release)
+        return self.__cachedfname("validsvg", accession, for_release)
 
     def get_validation_2fofc(self, accession, for_release=False):
-        return self.__getfname("valid2fo", accession, for_release)
+        return self.__cachedfname("valid2fo", accession, for_release)
 
     def get_validation_fofc(self, accession, for_release=False):
-        return self.__getfname("validfo", accession, for_release)
+        return self.__cachedfname("validfo", accession, for_release)
 
     def get_nmr_data(self, accession, for_release=False):
-        return self.__getfname("nmr_data", accession, for_release)
+        return self.__cachedfname("nmr_data", accession, for_release)
 
     def get_validation_image_tar(self, accession, for_release=False):
-        return self.__getfname("validimagetar", accession, for_release)
+        return self.__cachedfname("validimagetar", accession, for_release)
@@ -17,16 +17,35 @@ __version__ = "V0.07"
 import os
 import os.path
 import logging
+import threading
 
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
 
 logger = logging.getLogger(__name__)
 
+# The site configuration is immutable for a given site, so it is parsed once per site and shared
+_cICommonCache = {}
+_cICommonLock = threading.Lock()
+
+
+def _getConfigInfoAppCommon(siteId):
+    # With no siteId, ConfigInfo resolves the site from WWPDB_SITE_ID - include it in the key
+    key = (siteId, os.getenv("WWPDB_SITE_ID") if siteId is None else None)
+    with _cICommonLock:
+        cICommon = _cICommonCache.get(key)
+        if cICommon is None:
+            cICommon = ConfigInfoAppCommon(siteId)
+            _cICommonCache[key] = cICommon
+    return cICommon
+
 
 class ReleasePathInfo(object):
+    _LEGAL_SUBDIRS = frozenset(["added", "modified", "obsolete", "emd", "val_reports", "em_val_reports", "val_images"])
+    _LEGAL_EM_SUBPATHS = frozenset(["header", "map", "fsc", "images", "masks", "other", "validation"])
+
     def __init__(self, siteId=None):
         self.__siteId = siteId
-        self.__cICommon = ConfigInfoAppCommon(self.__siteId)
+        self.__cICommon = _getConfigInfoAppCommon(self.__siteId)
         self.current_folder_name = "current"
         self.previous_folder_name = "previous"
 
@@ -49,21 +68,13 @@ class ReleasePathInfo(object):
             basedir = os.path.join(basedir, self.previous_folder_name)
 
         if subdir:
-            if subdir not in ["added", "modified", "obsolete", "emd", "val_reports", "em_val_reports", "val_images"]:
+            if subdir not in self._LEGAL_SUBDIRS:
                 raise NameError("subdir %s not allowed" % subdir)
 
             basedir = os.path.join(basedir, subdir)
 
             if em_sub_path and accession:
-                if em_sub_path not in [
-                    "header",
-                    "map",
-                    "fsc",
-                    "images",
-                    "masks",
-                    "other",
-                    "validation",
-                ]:
+                if em_sub_path not in self._LEGAL_EM_SUBPATHS:
                     raise NameError("em_sub_path %s not allowed" % em_sub_path)
 
                 basedir = os.path.join(basedir, accession.upper(), em_sub_path)
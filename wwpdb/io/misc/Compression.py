@@ -1,25 +1,201 @@
 import os
+import gzip
+import zlib
 import shutil
 import logging
+import subprocess
 import tarfile
-from fnmatch import fnmatch
+from contextlib import ExitStack, contextmanager
+
+try:
+    import pgzip
+except ImportError:  # pragma: no cover
+    pgzip = None
 
 
 logger = logging.getLogger()
 
+# pgzip splits the stream into blocks compressed on all cores and indexed via
+# the gzip FEXTRA field, so the output remains readable by plain gunzip
+_PGZIP_BLOCKSIZE = 2 * 10**8
+# buffer size for the file and tar layers, so the kernel sees large writes rather than 10 KiB blocks
+_IO_BUFSIZE = 1 << 20
+# cold archives are written once and read back wholesale, so favour speed over ratio
+_DEFAULT_COMPRESSLEVEL = 1
+# external parallel gzip, used in preference to in-process compression for large depositions
+_PIGZ = shutil.which("pigz")
+
+
+def _gzip_open(fileobj, mode, compresslevel=_DEFAULT_COMPRESSLEVEL):
+    if pgzip is not None:
+        return pgzip.PgzipFile(fileobj=fileobj, mode=mode, compresslevel=compresslevel, thread=0, blocksize=_PGZIP_BLOCKSIZE)
+    return gzip.GzipFile(fileobj=fileobj, mode=mode, compresslevel=compresslevel)
+
+
+@contextmanager
+def _pigz_stream(path, mode, compresslevel=_DEFAULT_COMPRESSLEVEL):
+    """Yields a pipe to/from an external pigz process, which (de)compresses on all cores"""
+    ret = None
+    if mode == "w":
+        with open(path, "wb") as fp:
+            proc = subprocess.Popen([_PIGZ, f"-{compresslevel}", "-c"], stdin=subprocess.PIPE, stdout=fp, bufsize=_IO_BUFSIZE)
+            try:
+                yield proc.stdin
+            finally:
+                proc.stdin.close()
+                ret = proc.wait()
+    else:
+        with open(path, "rb") as fp:
+            proc = subprocess.Popen([_PIGZ, "-d", "-c"], stdin=fp, stdout=subprocess.PIPE, bufsize=_IO_BUFSIZE)
+            try:
+                yield proc.stdout
+                # tarfile stops at the end-of-archive marker - drain the rest so pigz can check the trailer
+                for _buf in iter(lambda: proc.stdout.read(_IO_BUFSIZE), b""):
+                    pass
+            finally:
+                proc.stdout.close()
+                ret = proc.wait()
+
+    if ret != 0:
+        raise Exception(f"pigz failed on {path} with exit status {ret}")  # pylint: disable=broad-exception-raised)
+
+
+@contextmanager
+def _gzip_stream(path, mode, compresslevel=_DEFAULT_COMPRESSLEVEL):
+    """Yields a binary gzip stream ("r" or "w") for path, preferring pigz when it is installed"""
+    with ExitStack() as stack:
+        if _PIGZ is not None:
+            gz = stack.enter_context(_pigz_stream(path, mode, compresslevel=compresslevel))
+        else:
+            fp = stack.enter_context(open(path, mode + "b", buffering=_IO_BUFSIZE))
+            gz = stack.enter_context(_gzip_open(fp, mode + "b", compresslevel=compresslevel))
+        yield gz
+
+
+@contextmanager
+def _open_tarball(path, mode, compresslevel=_DEFAULT_COMPRESSLEVEL):
+    """Opens a .tar.gz in streaming mode ("r" or "w"); members flow strictly forward through one pipeline"""
+    with _gzip_stream(path, mode, compresslevel=compresslevel) as gz, tarfile.open(fileobj=gz, mode=mode + "|", bufsize=_IO_BUFSIZE) as tf:
+        yield tf
+
+
+def _iter_gzip(path):
+    """Decodes a gzip file to the end, yielding the output in chunks.  zlib verifies each member's CRC-32
+    and length trailer; raises zlib.error on bad data, EOFError on truncation and tarfile.ReadError, as
+    tarfile.open() would, for an empty or non-gzip file
+
+    Block-parallel decoders such as rapidgzip are not used here: they check CRCs but silently
+    accept truncated streams and bad length trailers, which is exactly what this must catch"""
+    dec = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = False
+    members = 0
+
+    with open(path, "rb") as fp:
+        magic = fp.read(2)
+        if not magic:
+            raise tarfile.ReadError("empty file")
+        if magic != b"\x1f\x8b":
+            raise tarfile.ReadError("not a gzip file")
+        fp.seek(0)
+
+        for buf in iter(lambda: fp.read(_IO_BUFSIZE), b""):
+            while True:
+                # bound the output so highly compressible members do not balloon memory
+                out = dec.decompress(buf, _IO_BUFSIZE)
+                pending = True
+                if out:
+                    yield out
+
+                if dec.eof:
+                    # concatenated members (as written by pgzip) - restart on the remaining bytes
+                    members += 1
+                    buf = dec.unused_data
+                    dec = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    pending = False
+                    if not buf:
+                        break
+                    continue
+
+                buf = dec.unconsumed_tail
+                if not buf and len(out) < _IO_BUFSIZE:
+                    break
+
+    if pending:
+        raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+    if members == 0:
+        raise tarfile.ReadError("empty file")
+
+
+class _GzipCheckReader:
+    """Minimal read-only file object over _iter_gzip(), as consumed by a streaming tarfile"""
+
+    def __init__(self, path):
+        self._chunks = _iter_gzip(path)
+        self._buf = b""
+        self._pos = 0
+
+    def read(self, size=-1):
+        parts = []
+        while size != 0:
+            if self._pos == len(self._buf):
+                self._buf = next(self._chunks, b"")
+                self._pos = 0
+                if not self._buf:
+                    break
+            end = len(self._buf) if size < 0 else min(len(self._buf), self._pos + size)
+            parts.append(self._buf[self._pos : end])
+            size -= 0 if size < 0 else end - self._pos
+            self._pos = end
+        return b"".join(parts)
+
+    def drain(self):
+        """Decodes the rest of the gzip stream, past the end of the tar archive"""
+        for _chunk in self._chunks:
+            pass
+
+    def close(self):
+        self._chunks.close()
+
+
+class _CheckTarInfo(tarfile.TarInfo):
+    """TarInfo that fails on a bad header after the first member, where tarfile would just stop listing"""
+
+    @classmethod
+    def fromtarfile(cls, tarobj):  # pylint: disable=arguments-renamed
+        try:
+            return super().fromtarfile(tarobj)
+        except (tarfile.InvalidHeaderError, tarfile.TruncatedHeaderError) as e:
+            raise tarfile.ReadError(str(e)) from e
+
+
+def _check_tarball(path):
+    """Reads a gzipped tarball in one streaming pass, walking every tar member and verifying the gzip
+    trailers; raises tarfile.ReadError, EOFError or zlib.error on a corrupt tarball"""
+    reader = _GzipCheckReader(path)
+    try:
+        # members are only listed, so stream mode skips over their data without extracting it
+        with tarfile.open(fileobj=reader, mode="r|", bufsize=_IO_BUFSIZE, tarinfo=_CheckTarInfo) as tf:
+            for _member in tf:
+                pass
+        reader.drain()
+    finally:
+        reader.close()
+
 
 class Compression:
-    def __init__(self, config, dbapi) -> None:
+    def __init__(self, config, dbapi, compresslevel: int = _DEFAULT_COMPRESSLEVEL) -> None:
         # injecting dbapi so the connection can be opened only once
         # by the calling code, in case of multiple entries
-        self._archive_dir = os.path.join(config.get("SITE_ARCHIVE_STORAGE_PATH"), "archive")
+        archive_storage_path = config.get("SITE_ARCHIVE_STORAGE_PATH")
+        self._archive_dir = os.path.join(archive_storage_path, "archive")
         # maybe this should be read from a separate variable to allow this location to be separate from archive
-        self._cold_archive_dir = os.path.join(config.get("SITE_ARCHIVE_STORAGE_PATH"), "cold_archive")
+        self._cold_archive_dir = os.path.join(archive_storage_path, "cold_archive")
 
         if not os.path.exists(self._cold_archive_dir):
             raise Exception(f"{self._cold_archive_dir} does not exist")  # pylint: disable=broad-exception-raised)
 
         self._dbapi = dbapi
+        self._compresslevel = compresslevel
 
     def _can_be_compressed(self, dep_id: str):
         rows = self._dbapi.runSelectNQ(table="deposition", select=["notify", "locking"], where={"dep_set_id": dep_id})
@@ -57,8 +233,8 @@ class Compression:
         if not self.is_compressed(dep_id=dep_id):
             raise Exception(f"{dep_id} is not compressed")  # pylint: disable=broad-exception-raised)
 
-        with tarfile.open(dep_tarball, "r:gz") as fp:
-            fp.getmembers()
+        # raises tarfile.ReadError, EOFError or zlib.error on a corrupt tarball
+        _check_tarball(dep_tarball)
 
     def compress(self, dep_id: str, overwrite: bool = False):
         if not dep_id.startswith("D_"):
@@ -78,8 +254,9 @@ class Compression:
 
         logging.info("Compressing %s to %s", dep_archive, dep_tarball)
 
-        with tarfile.open(dep_tarball, "w:gz", debug=1) as tf:
-            tf.add(dep_archive, arcname=dep_id)
+        # streaming mode so tarfile never seeks back and the gzip layer can feed its block workers
+        with _open_tarball(dep_tarball, "w", compresslevel=self._compresslevel) as tf:
+            tf.add(dep_archive, arcname=dep_id, recursive=True)
 
         # this will throw if the file is corrupt
         self.check_tarball(dep_id=dep_id)
@@ -97,12 +274,12 @@ class Compression:
         if os.path.exists(dep_archive) and not overwrite:
             raise Exception(f"{dep_id} is already decompressed. Set `overwrite` to True to overwrite it.")  # pylint: disable=broad-exception-raised)
 
-        with tarfile.open(dep_tarball, "r:gz") as tf:
+        with _open_tarball(dep_tarball, "r") as tf:
             tf.extractall(self._archive_dir)
             logging.info(f"{dep_id} extracted successfully")  # pylint: disable=logging-fstring-interpolation
 
     def get_compressed_count(self):
-        for _root, _dirs, files in os.walk(self._cold_archive_dir):
-            tar_files = [tf for tf in files if fnmatch(tf, "*.tar.gz")]
-
-        return len(tar_files)
+        # only the top level holds tarballs - a single scandir pass also avoids
+        # reporting whichever subdirectory os.walk happened to visit last
+        with os.scandir(self._cold_archive_dir) as it:
+            return sum(1 for entry in it if entry.name.endswith(".tar.gz") and entry.is_file())
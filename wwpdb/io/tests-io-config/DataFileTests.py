@@ -12,25 +12,28 @@ import time
 import os
 import os.path
 import traceback
-import platform
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
-HERE = os.path.abspath(os.path.dirname(__file__))
-TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
-TESTOUTPUT = os.path.join(HERE, "test-output", platform.python_version())
-if not os.path.exists(TESTOUTPUT):
-    os.makedirs(TESTOUTPUT)  # pragma: no cover
-mockTopPath = os.path.join(TOPDIR, "wwpdb", "mock-data")
+# Must import before ConfigInfo - creates the test site configuration once per session
+from commonsetup import TESTOUTPUT  # pylint: disable=import-error
 
-# Must create config file before importing ConfigInfo
-from wwpdb.utils.testing.SiteConfigSetup import SiteConfigSetup  # noqa: E402
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.io.file.DataFile import DataFile
 
-SiteConfigSetup().setupEnvironment(TESTOUTPUT, mockTopPath)
 
-from wwpdb.utils.config.ConfigInfo import ConfigInfo  # noqa: E402
-from wwpdb.io.file.DataFile import DataFile  # noqa: E402
+class DataFileTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Shared source for the copy tests, built once - tests not using the test file must not depend on its configuration"""
+        cI = ConfigInfo()
+        testFilePath = cI.get("TEST_FILE_PATH")
+        cls.__srcFile = DataFile(os.path.join(testFilePath, cI.get("TEST_FILE"))) if testFilePath else None
 
+    @classmethod
+    def tearDownClass(cls):
+        cls.__srcFile = None
 
-class DataFileTests(unittest.TestCase):
     def setUp(self):
         cI = ConfigInfo()
         self.__testFilePath = cI.get("TEST_FILE_PATH")
@@ -48,95 +51,96 @@ class DataFileTests(unittest.TestCase):
     def testPrintInfo(self):
         """"""
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
-        try:
-            fPath = os.path.join(self.__testFilePath, self.__testFile)
-            f1 = DataFile(fPath)
-            f1.pr(self.lfh)
-        except:  # noqa: E722  # pragma: no cover
-            traceback.print_exc(file=sys.stdout)
-            self.fail()
+        f1 = self.__srcFile
+        f1.pr(self.lfh)
 
     def testCopyTimeModePreserve(self):
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
-        try:
-            fPath = os.path.join(self.__testFilePath, self.__testFile)
-            f1 = DataFile(fPath)
+        f1 = self.__srcFile
+        f1.pr(self.lfh)
+        #
+        f1.timeMode("preserve")
+        f1.copyMany([os.path.join(self.__outPath, fn) for fn in self.__outFileList])
+        for fn in self.__outFileList:
+            fp = os.path.join(self.__outPath, fn)
+            self.lfh.write("Files are the same  = %s\n" % str(f1.compare(fp)))
             f1.pr(self.lfh)
-            #
-            f1.timeMode("preserve")
-            for fn in self.__outFileList:
-                fp = os.path.join(self.__outPath, fn)
-                f1.copy(fp)
-                f1.pr(self.lfh)
-                self.lfh.write("Files are the same  = %s\n" % str(f1.compare()))
-                self.lfh.write("Source newer than %s\n" % f1.newerThan(fp))
-                f2 = DataFile(fp)
-                if f2.srcFileExists():
-                    f2.remove()
-        except:  # noqa: E722  # pragma: no cover
-            traceback.print_exc(file=sys.stdout)
-            self.fail()
+            self.lfh.write("Source newer than %s\n" % f1.newerThan(fp))
+            f2 = DataFile(fp)
+            if f2.srcFileExists():
+                f2.remove()
 
     def testCopyTimeModeToday(self):
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
-        try:
-            fPath = os.path.join(self.__testFilePath, self.__testFile)
-            f1 = DataFile(fPath)
+        f1 = self.__srcFile
+        f1.pr(self.lfh)
+        #
+        f1.timeMode("today")
+        f1.copyMany([os.path.join(self.__outPath, fn) for fn in self.__outFileList])
+        for fn in self.__outFileList:
+            fp = os.path.join(self.__outPath, fn)
+            self.lfh.write("Files are the same  = %s\n" % str(f1.compare(fp)))
             f1.pr(self.lfh)
-            #
-            f1.timeMode("today")
-            for fn in self.__outFileList:
-                fp = os.path.join(self.__outPath, fn)
-                f1.copy(fp)
-                f1.pr(self.lfh)
-                self.lfh.write("Files are the same  = %s\n" % str(f1.compare()))
-                self.lfh.write("Source newer than %s\n" % f1.newerThan(fp))
-                f2 = DataFile(fp)
-                if f2.srcFileExists():
-                    f2.remove()
-        except:  # noqa: E722  # pragma: no cover
-            traceback.print_exc(file=sys.stdout)
-            self.fail()
+            self.lfh.write("Source newer than %s\n" % f1.newerThan(fp))
+            f2 = DataFile(fp)
+            if f2.srcFileExists():
+                f2.remove()
 
     def testCopyTimeModeNone(self):
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
-        try:
-            fPath = os.path.join(self.__testFilePath, self.__testFile)
-            f1 = DataFile(fPath)
+        f1 = self.__srcFile
+        f1.pr(self.lfh)
+        #
+        f1.timeMode(None)
+        f1.copyMany([os.path.join(self.__outPath, fn) for fn in self.__outFileList])
+        for fn in self.__outFileList:
+            fp = os.path.join(self.__outPath, fn)
+            self.lfh.write("Files are the same  = %s\n" % str(f1.compare(fp)))
             f1.pr(self.lfh)
-            #
-            f1.timeMode(None)
-            for fn in self.__outFileList:
-                fp = os.path.join(self.__outPath, fn)
-                f1.copy(fp)
-                f1.pr(self.lfh)
-                self.lfh.write("Files are the same  = %s\n" % str(f1.compare()))
-                self.lfh.write("Source newer than %s\n" % str(f1.newerThan(fp)))
-                f2 = DataFile(fp)
-                if f2.srcFileExists():
-                    f2.remove()
-        except:  # noqa: E722  # pragma: no cover
-            traceback.print_exc(file=sys.stdout)
-            self.fail()
+            self.lfh.write("Source newer than %s\n" % str(f1.newerThan(fp)))
+            f2 = DataFile(fp)
+            if f2.srcFileExists():
+                f2.remove()
+
+    def testCopyManySameFile(self):
+        """Repeated destinations are copied once and the source is never a destination"""
+        self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
+        srcPath = os.path.join(TESTOUTPUT, "copymany_src.dat")
+        linkPath = os.path.join(TESTOUTPUT, "copymany_link.dat")
+        dstPath = os.path.join(TESTOUTPUT, "copymany_dst.dat")
+        for fPath in (srcPath, linkPath, dstPath):
+            if os.path.exists(fPath):
+                os.remove(fPath)
+        with open(srcPath, "w") as ofh:
+            ofh.write("copyMany source\n")
+        os.link(srcPath, linkPath)
+
+        f1 = DataFile(srcPath)
+        f1.copyMany([dstPath, dstPath])
+        self.assertTrue(f1.compare(dstPath))
+        for dstPathList in ([srcPath], [dstPath, linkPath]):
+            with self.assertRaises(shutil.SameFileError):
+                f1.copyMany(dstPathList)
+            with open(srcPath) as ifh:
+                self.assertEqual(ifh.read(), "copyMany source\n")
+
+        for fPath in (srcPath, linkPath, dstPath):
+            os.remove(fPath)
 
     def testSymbolicLinks(self):
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
-        try:
-            fList = [self.__testFile, self.__testFileGzip, self.__testFileZlib, self.__testFileBzip]
-            for fn in fList:
-                fPath = os.path.join(self.__testFilePath, fn)
-                f1 = DataFile(fPath)
-                fp = os.path.join(self.__outPath, fn)
-                f1.symLinkRelative(fp)
-                f1.pr()
-                self.lfh.write("Files are the same  = %s\n" % str(f1.compare()))
-                self.lfh.write("Source newer than %s\n" % str(f1.newerThan(fp)))
-                f2 = DataFile(fp)
-                if f2.srcFileExists():
-                    f2.remove()
-        except:  # noqa: E722  # pragma: no cover
-            traceback.print_exc(file=sys.stdout)
-            self.fail()
+        fList = [self.__testFile, self.__testFileGzip, self.__testFileZlib, self.__testFileBzip]
+        for fn in fList:
+            fPath = os.path.join(self.__testFilePath, fn)
+            f1 = DataFile(fPath)
+            fp = os.path.join(self.__outPath, fn)
+            f1.symLinkRelative(fp)
+            f1.pr()
+            self.lfh.write("Files are the same  = %s\n" % str(f1.compare()))
+            self.lfh.write("Source newer than %s\n" % str(f1.newerThan(fp)))
+            f2 = DataFile(fp)
+            if f2.srcFileExists():
+                f2.remove()
 
     @unittest.skip("Not sending email during tests")
     def testFileEMail(self):  # pragma: no cover
@@ -153,10 +157,12 @@ class DataFileTests(unittest.TestCase):
         """Tests accessing times"""
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
         fList = [self.__testFile, self.__testFileGzip, self.__testFileZlib, self.__testFileBzip]
+        # One directory sweep - DirEntry caches the stat results used as the reference times
+        entries = {e.name: e.stat() for e in os.scandir(self.__testFilePath)}
         for fn in fList:
-            fPath = os.path.join(self.__testFilePath, fn)
-            f1 = DataFile(fPath)
+            f1 = DataFile(os.path.join(self.__testFilePath, fn))
             self.assertIsNotNone(f1.srcModTimeStamp())
+            self.assertEqual(f1.srcModTimeStamp(), time.strftime("%Y-%m-%d:%H:%M:%S", time.localtime(entries[fn].st_mtime)))
 
         # Test non existant case
         f1 = DataFile(os.path.join(TESTOUTPUT, "nonexistant"))
@@ -209,7 +215,6 @@ class DataFileTests(unittest.TestCase):
         self.lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
 
         f1path = os.path.join(TESTOUTPUT, "startfile.tst")
-        f2path = os.path.join(TESTOUTPUT, "movedest.tst")
         f3path = os.path.join(TESTOUTPUT, "appendest.tst")
         if os.path.exists(f3path):
             os.remove(f3path)
@@ -219,34 +224,45 @@ class DataFileTests(unittest.TestCase):
         # For test coverage
         f1.src(f1path)
 
-        f3len = 0
-        for tmode in ["preserve", "today", "yesterday", "tomorrow", "lastweek"]:
-            for f in [f1path, f2path]:
+        def prepare(tmode):
+            # Each time mode works on its own files so the modes can run concurrently
+            tf1path = os.path.join(TESTOUTPUT, "startfile_%s.tst" % tmode)
+            tf2path = os.path.join(TESTOUTPUT, "movedest_%s.tst" % tmode)
+            for f in [tf1path, tf2path]:
                 if os.path.exists(f):
                     os.remove(f)
 
-            with open(f1path, "w") as f:
+            with open(tf1path, "w") as f:
                 f.write(tmode)
-                pass
 
-            d1 = DataFile(f1path)
+            d1 = DataFile(tf1path)
             d1.timeMode(tmode)
             self.assertTrue(d1.setSrcFileMode(0o644))
 
             self.assertEqual(d1.srcFileSize(), len(tmode))
             # Pre copy - no dst set
             self.assertEqual(d1.dstFileSize(), 0)
+            return d1
 
-            # Test append
-            d1.append(f3path)
-            f3len += len(tmode)
-            d3 = DataFile(f3path)
-            self.assertEqual(d3.srcFileSize(), f3len)
-
-            d1.move(f2path)
+        def move(tmode, d1):
+            d1.move(os.path.join(TESTOUTPUT, "movedest_%s.tst" % tmode))
             self.assertTrue(d1.setDstFileMode(0o644))
             self.assertEqual(d1.dstFileSize(), len(tmode))
 
+        tmodes = ["preserve", "today", "yesterday", "tomorrow", "lastweek"]
+        with ThreadPoolExecutor(max_workers=len(tmodes)) as executor:
+            dfList = list(executor.map(prepare, tmodes))
+
+            # Appends share one destination - keep them sequential
+            f3len = 0
+            for tmode, d1 in zip(tmodes, dfList):
+                d1.append(f3path)
+                f3len += len(tmode)
+                d3 = DataFile(f3path)
+                self.assertEqual(d3.srcFileSize(), f3len)
+
+            list(executor.map(move, tmodes, dfList))
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
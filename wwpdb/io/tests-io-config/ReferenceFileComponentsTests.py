@@ -16,23 +16,11 @@ __version__ = "V0.01"
 import sys
 import unittest
 import traceback
-import os
-import os.path
-import platform
 
-HERE = os.path.abspath(os.path.dirname(__file__))
-TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
-TESTOUTPUT = os.path.join(HERE, "test-output", platform.python_version())
-if not os.path.exists(TESTOUTPUT):
-    os.makedirs(TESTOUTPUT)  # pragma: no cover
-mockTopPath = os.path.join(TOPDIR, "wwpdb", "mock-data")
+# Must import before ConfigInfo - creates the test site configuration once per session
+from commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=import-error,unused-import
 
-# Must create config file before importing ConfigInfo
-from wwpdb.utils.testing.SiteConfigSetup import SiteConfigSetup  # noqa: E402
-
-SiteConfigSetup().setupEnvironment(TESTOUTPUT, mockTopPath)
-
-from wwpdb.io.locator.DataReference import ReferenceFileComponents, ReferenceFileInfo  # noqa: E402
+from wwpdb.io.locator.DataReference import ReferenceFileComponents, ReferenceFileInfo
 
 
 class ReferenceFileComponentsTests(unittest.TestCase):
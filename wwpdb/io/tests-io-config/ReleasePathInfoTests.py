@@ -13,24 +13,13 @@ __author__ = "Ezra Peisach"
 __email__ = "peisach@rcsb.rutgers.edu"
 
 import unittest
-import os
-import platform
 import logging
 
-HERE = os.path.abspath(os.path.dirname(__file__))
-TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
-TESTOUTPUT = os.path.join(HERE, "test-output", platform.python_version())
-if not os.path.exists(TESTOUTPUT):
-    os.makedirs(TESTOUTPUT)  # pragma: no cover
-mockTopPath = os.path.join(TOPDIR, "wwpdb", "mock-data")
+# Must import before ConfigInfo - creates the test site configuration once per session
+from commonsetup import TESTOUTPUT  # noqa: F401 pylint: disable=import-error,unused-import
 
-# Must create config file before importing ConfigInfo
-from wwpdb.utils.testing.SiteConfigSetup import SiteConfigSetup  # noqa: E402
-
-SiteConfigSetup().setupEnvironment(TESTOUTPUT, mockTopPath)
-
-from wwpdb.utils.config.ConfigInfo import getSiteId  # noqa: E402
-from wwpdb.io.locator.ReleasePathInfo import ReleasePathInfo  # noqa: E402
+from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.io.locator.ReleasePathInfo import ReleasePathInfo
 
 FORMAT = "[%(levelname)s]-%(module)s.%(funcName)s: %(message)s"
 logging.basicConfig(format=FORMAT, level=logging.DEBUG)
@@ -53,8 +42,8 @@ class ReleasePathInfoTests(unittest.TestCase):
             [None, "current"],
             ["modified", "previous"],
         ]
+        rpi = ReleasePathInfo(self.__siteId)
         for subdir, vers in tests:
-            rpi = ReleasePathInfo(self.__siteId)
             if vers and subdir:
                 ret = rpi.getForReleasePath(subdir=subdir, version=vers)
             elif vers:
@@ -78,8 +67,8 @@ class ReleasePathInfoTests(unittest.TestCase):
             "other",
             "validation",
         ]
+        rpi = ReleasePathInfo(self.__siteId)
         for emsubdir in emsub:
-            rpi = ReleasePathInfo(self.__siteId)
             ret = rpi.getForReleasePath(subdir="emd", accession="EMD-1000", em_sub_path=emsubdir)
             # print(ret)
             self.assertIsNotNone(ret)
@@ -0,0 +1,27 @@
+##
+# File:    commonsetup.py
+#
+# Shared setup for the test modules in this directory.
+##
+"""
+Creates the test site configuration that must exist before ConfigInfo is imported.
+
+The test modules import this module first - Python caches the import, so the configuration
+is written once per test session whichever module is collected first.
+
+"""
+
+import os
+import platform
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+TESTOUTPUT = os.path.join(HERE, "test-output", platform.python_version())
+if not os.path.exists(TESTOUTPUT):
+    os.makedirs(TESTOUTPUT)  # pragma: no cover
+mockTopPath = os.path.join(TOPDIR, "wwpdb", "mock-data")
+
+# Must create config file before importing ConfigInfo
+from wwpdb.utils.testing.SiteConfigSetup import SiteConfigSetup  # noqa: E402
+
+SiteConfigSetup().setupEnvironment(TESTOUTPUT, mockTopPath)
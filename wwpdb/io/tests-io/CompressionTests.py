@@ -1,8 +1,11 @@
+import io
 import os
+import gzip
 import json
 import pytest
 import shutil
-import importlib
+import tarfile
+from pathlib import Path
 from unittest.mock import Mock
 
 from wwpdb.io.misc.Compression import Compression
@@ -21,47 +24,63 @@ def compile_site_config():
     ci.writeConfigCache(siteLoc="test", siteId="TEST")
 
 
-@pytest.fixture
-def mock_config(monkeypatch):
-    with open("./wwpdb/io/tests-io/fixtures/site-config/test/test/ConfigInfoFileCache.json") as fp:
-        test_config = json.load(fp)
-    monkeypatch.setattr(ConfigInfoData, "getConfigDictionary", lambda s: test_config["TEST"])
-    module = importlib.import_module("wwpdb.io.misc.Compression")
-    importlib.reload(module)
+_TEST_CONFIG = json.loads(Path("./wwpdb/io/tests-io/fixtures/site-config/test/test/ConfigInfoFileCache.json").read_text())
 
 
-@pytest.fixture
-def config():
-    from wwpdb.utils.config.ConfigInfo import ConfigInfo  # pylint: disable=redefined-outer-name,reimported
+# module scoped so the patch is applied once for this file and does not leak into other test modules
+@pytest.fixture(scope="module")
+def mock_config(tmp_path_factory):
+    # private archive root per module and xdist worker, rather than the shared /tmp path in the site config
+    test_config = dict(_TEST_CONFIG["TEST"], SITE_ARCHIVE_STORAGE_PATH=str(tmp_path_factory.mktemp("onedep")))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ConfigInfoData, "getConfigDictionary", lambda s: test_config)
+        yield
+
 
+@pytest.fixture(scope="module")
+def config(mock_config):  # pylint: disable=unused-argument,redefined-outer-name
     return ConfigInfo(siteId="TEST")
 
 
-@pytest.fixture
-def archive_dir(mock_config, config):  # pylint: disable=unused-argument,redefined-outer-name
+@pytest.fixture(scope="module")
+def onedep_dirs(config):  # pylint: disable=redefined-outer-name
+    # resolved once per module - (archive, cold_archive) under the private archive root
     onedep_base = config.get("SITE_ARCHIVE_STORAGE_PATH")
+    return os.path.join(onedep_base, "archive"), os.path.join(onedep_base, "cold_archive")
+
+
+@pytest.fixture
+def archive_dir(onedep_dirs):  # pylint: disable=redefined-outer-name
+    for path in onedep_dirs:
+        os.makedirs(path, exist_ok=True)
+
+    yield onedep_dirs[0]
+
+    # pytest removes the base directory itself; emptying it here gives every test a clean archive
+    for path in onedep_dirs:
+        shutil.rmtree(path, ignore_errors=True)
 
-    if onedep_base is None or not onedep_base.startswith("/tmp"):
-        raise Exception("Error getting test archive dir")  # pylint: disable=broad-exception-raised
 
-    l_archive_dir = os.path.join(onedep_base, "archive")
-    cold_archive_dir = os.path.join(onedep_base, "cold_archive")
-    os.makedirs(l_archive_dir, exist_ok=True)
-    os.makedirs(cold_archive_dir, exist_ok=True)
+@pytest.fixture(scope="module")
+def compression(config, onedep_dirs):  # pylint: disable=redefined-outer-name
+    # Compression requires cold_archive to exist when constructed; archive_dir recreates it for each test
+    os.makedirs(onedep_dirs[1], exist_ok=True)
+    return Compression(config, Mock())
 
-    yield l_archive_dir
 
-    shutil.rmtree(onedep_base)
+@pytest.fixture
+def mock_db(compression):  # pylint: disable=redefined-outer-name
+    # fresh database mock per test so return values configured by one test never leak into the next
+    compression._dbapi = Mock()  # pylint: disable=protected-access
+    return compression._dbapi  # pylint: disable=protected-access
 
 
-def test_compression(monkeypatch, archive_dir):  # pylint: disable=unused-argument,redefined-outer-name
+def test_compression(monkeypatch, archive_dir, compression, mock_db):  # pylint: disable=unused-argument,redefined-outer-name
     dep_dir = os.path.join(archive_dir, "D_800001")
     os.makedirs(dep_dir, exist_ok=True)
-    open(os.path.join(dep_dir, "foo"), "w").close()
+    Path(dep_dir, "foo").touch()
 
-    mock_db = Mock()
     mock_db.runSelectNQ.return_value = [["", ""]]
-    compression = Compression(ConfigInfo(), mock_db)
 
     # compression
     compression.compress(dep_id="D_800001")
@@ -80,20 +99,18 @@ def test_compression(monkeypatch, archive_dir):  # pylint: disable=unused-argume
     assert os.path.exists(os.path.join(dep_dir, "foo"))
 
 
-def test_overwrite_compression(monkeypatch, archive_dir):  # pylint: disable=unused-argument,redefined-outer-name
+def test_overwrite_compression(monkeypatch, archive_dir, compression, mock_db):  # pylint: disable=unused-argument,redefined-outer-name
     dep_dir = os.path.join(archive_dir, "D_800001")
     os.makedirs(dep_dir, exist_ok=True)
 
-    mock_db = Mock()
     mock_db.runSelectNQ.return_value = [["", ""]]
-    compression = Compression(ConfigInfo(), mock_db)
     compression.compress(dep_id="D_800001")
 
     with pytest.raises(Exception):
         compression.compress(dep_id="D_800001")
 
     os.makedirs(dep_dir, exist_ok=True)
-    open(os.path.join(dep_dir, "foo"), "w").close()
+    Path(dep_dir, "foo").touch()
     compression.compress(dep_id="D_800001", overwrite=True)
 
     compression.decompress(dep_id="D_800001")
@@ -102,42 +119,81 @@ def test_overwrite_compression(monkeypatch, archive_dir):  # pylint: disable=unu
         compression.decompress(dep_id="D_800001")
 
 
-def test_corrupted_file(archive_dir):  # pylint: disable=redefined-outer-name
+def test_corrupted_file(archive_dir, compression):  # pylint: disable=redefined-outer-name
     dep_dir = os.path.join(archive_dir, "D_800001")
     cold_archive = os.path.join(archive_dir, "..", "cold_archive")
     os.makedirs(dep_dir, exist_ok=True)
     shutil.copy("./wwpdb/io/tests-io/fixtures/corrupt.tar.gz", os.path.join(cold_archive, "D_800001.tar.gz"))
-    compression = Compression(ConfigInfo(), Mock())
 
-    with pytest.raises(Exception):
+    with pytest.raises(EOFError):
         # early end of file
         compression.check_tarball(dep_id="D_800001")
 
     assert os.path.exists(os.path.join(cold_archive, "D_800001.tar.gz"))
 
 
-def test_count(archive_dir):  # pylint: disable=redefined-outer-name
+def test_invalid_tarball(archive_dir, compression):  # pylint: disable=redefined-outer-name
+    cold_archive = os.path.join(archive_dir, "..", "cold_archive")
+    dep_tarball = os.path.join(cold_archive, "D_800001.tar.gz")
+
+    # zero-byte file, gzip stream without a tar payload, gzip stream with a truncated tar header
+    for payload in (None, b"", b"not a tar header"):
+        if payload is None:
+            Path(dep_tarball).write_bytes(b"")
+        else:
+            with gzip.open(dep_tarball, "wb") as fp:
+                fp.write(payload)
+
+        with pytest.raises(tarfile.ReadError):
+            compression.check_tarball(dep_id="D_800001")
+
+
+def test_corrupt_tar_member(archive_dir, compression):  # pylint: disable=redefined-outer-name
+    cold_archive = os.path.join(archive_dir, "..", "cold_archive")
+    dep_tarball = os.path.join(cold_archive, "D_800001.tar.gz")
+
+    raw = io.BytesIO()
+    with tarfile.open(fileobj=raw, mode="w") as tf:
+        for name in ("foo", "bar"):
+            info = tarfile.TarInfo(name)
+            info.size = 1000
+            tf.addfile(info, io.BytesIO(b"x" * info.size))
+    raw = raw.getvalue()
+
+    # a valid gzip stream and first header, but a garbled header for the second member, then a truncated archive
+    second = tarfile.BLOCKSIZE + 1024
+    for payload in (raw[:second] + b"\xff" * tarfile.BLOCKSIZE + raw[second + tarfile.BLOCKSIZE :], raw[: second + 100]):
+        with gzip.open(dep_tarball, "wb") as fp:
+            fp.write(payload)
+
+        with pytest.raises(tarfile.ReadError):
+            compression.check_tarball(dep_id="D_800001")
+
+
+def test_count(archive_dir, compression):  # pylint: disable=redefined-outer-name
     cold_archive = os.path.join(archive_dir, "..", "cold_archive")
-    compression = Compression(ConfigInfo(), Mock())
 
     for i in range(5):
-        open(os.path.join(cold_archive, f"{i}.tar.gz"), "w").close()
+        Path(cold_archive, f"{i}.tar.gz").touch()
 
     for i in range(3):
-        open(os.path.join(cold_archive, f"{i}.txt"), "w").close()
+        Path(cold_archive, f"{i}.txt").touch()
+
+    # tarballs in subdirectories, and directories named like tarballs, are not counted
+    sub_dir = Path(cold_archive, "sub")
+    sub_dir.mkdir()
+    Path(sub_dir, "5.tar.gz").touch()
+    Path(cold_archive, "6.tar.gz").mkdir()
 
     assert compression.get_compressed_count() == 5
 
 
-def test_compression_precheck(archive_dir, monkeypatch):  # pylint: disable=unused-argument,redefined-outer-name
+def test_compression_precheck(archive_dir, monkeypatch, compression, mock_db):  # pylint: disable=unused-argument,redefined-outer-name
     dep_dir = os.path.join(archive_dir, "D_800001")
     os.makedirs(dep_dir, exist_ok=True)
 
-    mock_db = Mock()
     mock_db.runSelectNQ.return_value = [["*", ""]]
 
-    compression = Compression(ConfigInfo(), mock_db)
-
     with pytest.raises(Exception):
         compression.compress(dep_id="D_800001")
 
@@ -30,6 +30,7 @@ import os
 import os.path
 import traceback
 import shutil
+import filecmp
 
 from wwpdb.io.cvs.CvsAdmin import CvsAdmin, CvsSandBoxAdmin
 from wwpdb.utils.testing.Features import Features
@@ -73,6 +74,46 @@ class CvsAdminTests(unittest.TestCase):
             traceback.print_exc(file=self.__lfh)
             self.fail()
 
+    def testCvsHistoryCache(self):
+        """"""
+        self.__lfh.write("Starting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
+        try:
+            vc = CvsAdmin(tmpPath="./", cacheHistory=True)
+            vc.setRepositoryPath(host=self.__cvsRepositoryHost, path=self.__cvsRepositoryPath)
+            vc.setAuthInfo(user=self.__cvsUser, password=self.__cvsPassword)
+            # count the repository round trips
+            runL = []
+            runCvsCommand = vc._runCvsCommand
+
+            def countedRun(*args, **kwargs):
+                runL.append(kwargs)
+                return runCvsCommand(*args, **kwargs)
+
+            vc._runCvsCommand = countedRun
+            #
+            ok, text = vc.getHistory(cvsPath=self.__testFilePath)
+            self.assertTrue(ok)
+            ok, revList = vc.getRevisionList(cvsPath=self.__testFilePath)
+            self.assertTrue(ok)
+            self.assertEqual(len(runL), 2)
+            # cache hits - callers get their own revision list
+            revList.append(("0.0", "M", ""))
+            self.assertEqual(vc.getHistory(cvsPath=self.__testFilePath), (True, text))
+            self.assertEqual(vc.getRevisionList(cvsPath=self.__testFilePath), (True, revList[:-1]))
+            self.assertEqual(len(runL), 2)
+            #
+            vc.invalidateHistory(cvsPath=self.__testFilePath)
+            self.assertEqual(vc.getHistory(cvsPath=self.__testFilePath), (True, text))
+            self.assertEqual(len(runL), 3)
+            vc.invalidateHistory()
+            self.assertEqual(vc.getRevisionList(cvsPath=self.__testFilePath), (True, revList[:-1]))
+            self.assertEqual(len(runL), 4)
+            vc.cleanup()
+        except Exception as e:
+            self.__lfh.write("Exception in %s %s\n" % (self.__class__.__name__, str(e)))
+            traceback.print_exc(file=self.__lfh)
+            self.fail()
+
     def testCvsCheckOutFile(self):
         """"""
         self.__lfh.write("Starting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
@@ -207,10 +248,59 @@ class CvsAdminTests(unittest.TestCase):
             traceback.print_exc(file=self.__lfh)
             self.fail()
 
+    def testCvsRemoveList(self):
+        """"""
+        self.__lfh.write("Starting %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name))
+        try:
+            text = ""
+            vc = CvsSandBoxAdmin(tmpPath="./")
+            vc.setRepositoryPath(host=self.__cvsRepositoryHost, path=self.__cvsRepositoryPath)
+            vc.setAuthInfo(user=self.__cvsUser, password=self.__cvsPassword)
+            #
+            vc.setSandBoxTopPath("./CVSWORK")
+            ok, text = vc.checkOut(projectPath=self.__testProjectName)
+            self.__lfh.write("CVS checkout status %r output is:\n%s\n" % (ok, text))
+            #
+            projPath = os.path.join(vc.getSandBoxTopPath(), self.__testProjectName)
+            dstDir = "D2"
+            dstPath = os.path.join(projPath, dstDir)
+            if not os.access(dstPath, os.F_OK):
+                os.mkdir(dstPath)
+            vc.add(self.__testProjectName, dstDir)
+            rPathList = []
+            for fn in ["F1.DAT", "F2.DAT"]:
+                shutil.copy2(self.__testFilePath2, os.path.join(dstPath, fn))
+                rPath = os.path.join(dstDir, fn)
+                vc.add(self.__testProjectName, rPath)
+                vc.commit(self.__testProjectName, rPath)
+                rPathList.append(rPath)
+            #
+            ok, text = vc.removeList(self.__testProjectName, rPathList, saveCopy=True)
+            self.__lfh.write("CVS remove list status %r output is:\n%s\n" % (ok, text))
+            self.assertTrue(ok)
+            for rPath in rPathList:
+                self.assertFalse(os.path.exists(os.path.join(projPath, rPath)))
+                savePath = os.path.join(projPath, "REMOVED", os.path.basename(rPath))
+                self.assertTrue(os.path.isfile(savePath))
+                self.assertTrue(filecmp.cmp(self.__testFilePath2, savePath, shallow=False))
+                os.remove(savePath)
+
+            vc.remove(self.__testProjectName, dstDir)
+
+            ok, text = vc.update(projectDir=self.__testProjectName, prune=True)
+            self.__lfh.write("CVS update status %r output is:\n%s\n" % (ok, text))
+            #
+            vc.cleanup()
+        except Exception as e:
+            self.__lfh.write("Exception in  %s %s %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name, str(e)))
+            traceback.print_exc(file=self.__lfh)
+            self.fail()
+
 
 def suiteCvsTests():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(CvsAdminTests("testCvsHistory"))
+    suiteSelect.addTest(CvsAdminTests("testCvsHistoryCache"))
     suiteSelect.addTest(CvsAdminTests("testCvsCheckOutFile"))
     suiteSelect.addTest(CvsAdminTests("testCvsCheckOutRevisions"))
     return suiteSelect
@@ -221,6 +311,7 @@ def suiteCvsSandBoxTests():
     suiteSelect.addTest(CvsAdminTests("testCvsCheckOutProject"))
     suiteSelect.addTest(CvsAdminTests("testCvsUpdateProject"))
     suiteSelect.addTest(CvsAdminTests("testCvsAddCommit"))
+    suiteSelect.addTest(CvsAdminTests("testCvsRemoveList"))
     return suiteSelect
 
 
@@ -26,6 +26,9 @@ import unittest
 import os
 import os.path
 import logging
+import shutil
+import filecmp
+import tempfile
 
 from wwpdb.io.cvs.CvsUtility import CvsWrapper
 from wwpdb.utils.testing.Features import Features
@@ -33,34 +36,36 @@ from wwpdb.utils.testing.Features import Features
 
 @unittest.skipUnless(Features().haveCvsTestServer(), "Needs CVS server for testing")
 class CvsUtilityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """One configured wrapper and scratch directory shared by all test cases."""
+        # Private scratch directory so test modules may run concurrently (e.g. pytest-xdist)
+        cls._tmpPath = tempfile.mkdtemp(prefix="cvs-test-")
+        cls._vc = CvsWrapper(tmpPath=cls._tmpPath)
+        cls._vc.setRepositoryPath(host=os.getenv("CVS_TEST_SERVER"), path="/cvs-ligands")
+        cls._vc.setAuthInfo(user=os.getenv("CVS_TEST_USER"), password=os.getenv("CVS_TEST_PW"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._vc.cleanup()
+        shutil.rmtree(cls._tmpPath, ignore_errors=True)
+
     def setUp(self):
         self.__logger = logging.getLogger("wwpdb.utils.rcsb")
         #
         self.__testFilePath = "ligand-dict-v3/A/ATP/ATP.cif"
-        #
-        self.__cvsRepositoryPath = "/cvs-ligands"
-        self.__cvsRepositoryHost = os.getenv("CVS_TEST_SERVER")
-
-        self.__cvsUser = os.getenv("CVS_TEST_USER")
-        self.__cvsPassword = os.getenv("CVS_TEST_PW")
-
-    def tearDown(self):
-        pass
 
     def testCvsHistory(self):
         """"""
         self.__logger.info("Starting %s %s", self.__class__.__name__, sys._getframe().f_code.co_name)
         try:
             text = ""
-            vc = CvsWrapper(tmpPath="./")
-            vc.setRepositoryPath(host=self.__cvsRepositoryHost, path=self.__cvsRepositoryPath)
-            vc.setAuthInfo(user=self.__cvsUser, password=self.__cvsPassword)
+            vc = self._vc
             text = vc.getHistory(cvsPath=self.__testFilePath)
             self.__logger.debug("CVS history for %s is:\n%s\n", self.__testFilePath, text)
             #
             revList = vc.getRevisionList(cvsPath=self.__testFilePath)
             self.__logger.debug("CVS revision list for %s is:\n%r\n", self.__testFilePath, revList)
-            vc.cleanup()
         except Exception as e:
             self.__logger.exception("Exception in %s %s", self.__class__.__name__, str(e))
             self.fail()
@@ -70,13 +75,9 @@ class CvsUtilityTests(unittest.TestCase):
         self.__logger.info("Starting %s %s", self.__class__.__name__, sys._getframe().f_code.co_name)
         try:
             text = ""
-            vc = CvsWrapper(tmpPath="./")
-            vc.setRepositoryPath(host=self.__cvsRepositoryHost, path=self.__cvsRepositoryPath)
-            vc.setAuthInfo(user=self.__cvsUser, password=self.__cvsPassword)
-            text = vc.checkOutFile(cvsPath=self.__testFilePath, outPath="ATP-latest.cif")
+            vc = self._vc
+            text = vc.checkOutFile(cvsPath=self.__testFilePath, outPath=os.path.join(self._tmpPath, "ATP-latest.cif"))
             self.__logger.debug("CVS checkout output %s is:\n%s\n", self.__testFilePath, text)
-            #
-            vc.cleanup()
         except:  # noqa: E722 pylint: disable=bare-except
             self.__logger.exception("Exception in %s", self.__class__.__name__)
             self.fail()
@@ -86,9 +87,7 @@ class CvsUtilityTests(unittest.TestCase):
         self.__logger.info("Starting %s %s", self.__class__.__name__, sys._getframe().f_code.co_name)
         try:
             text = ""
-            vc = CvsWrapper(tmpPath="./")
-            vc.setRepositoryPath(host=self.__cvsRepositoryHost, path=self.__cvsRepositoryPath)
-            vc.setAuthInfo(user=self.__cvsUser, password=self.__cvsPassword)
+            vc = self._vc
 
             revList = vc.getRevisionList(cvsPath=self.__testFilePath)
             self.__logger.debug("CVS revision list for %s is:\n%r\n", self.__testFilePath, revList)
@@ -96,13 +95,41 @@ class CvsUtilityTests(unittest.TestCase):
             (_pth, fn) = os.path.split(self.__testFilePath)
             (base, ext) = os.path.splitext(fn)
 
-            for revId in revList:
-                rId = revId[0]
-                outPath = base + "-" + rId + "." + ext
-                text = vc.checkOutFile(cvsPath=self.__testFilePath, outPath=outPath, revId=rId)
-                self.__logger.debug("CVS checkout output %s is:\n%s\n", self.__testFilePath, text)
-            #
-            vc.cleanup()
+            revOutList = [(revId[0], os.path.join(self._tmpPath, base + "-" + revId[0] + "." + ext)) for revId in revList]
+            statusList = vc.checkOutFiles(cvsPath=self.__testFilePath, revOutList=revOutList, maxWorkers=8)
+            self.assertEqual(len(statusList), len(revOutList))
+            for (rId, outPath), (ok, text) in zip(revOutList, statusList):
+                self.__logger.debug("CVS checkout output %s revision %s is:\n%s\n", self.__testFilePath, rId, text)
+                self.assertTrue(ok)
+                self.assertTrue(os.path.exists(outPath))
+        except:  # noqa: E722 pylint: disable=bare-except
+            self.__logger.exception("Exception in %s", self.__class__.__name__)
+            self.fail()
+
+    def testCvsCheckOutFileList(self):
+        """"""
+        self.__logger.info("Starting %s %s", self.__class__.__name__, sys._getframe().f_code.co_name)
+        try:
+            vc = self._vc
+            revList = vc.getRevisionList(cvsPath=self.__testFilePath)
+            self.assertGreaterEqual(len(revList), 2)
+            listPath = os.path.join(self._tmpPath, "list")
+            refPath = os.path.join(self._tmpPath, "ref")
+            os.makedirs(listPath, exist_ok=True)
+            os.makedirs(refPath, exist_ok=True)
+            rIdList = [None] + [revId[0] for revId in revList[:2]]
+            fileList = [(self.__testFilePath, os.path.join(listPath, "ATP-list-%s.cif" % (rId or "latest")), rId) for rId in rIdList]
+            textList = vc.checkOutFileList(fileList)
+            self.assertEqual(len(textList), len(fileList))
+            # only the requested output paths are written
+            self.assertEqual(sorted(os.listdir(listPath)), sorted(os.path.basename(outPath) for _cvsPath, outPath, _rId in fileList))
+            for (_cvsPath, outPath, rId), text in zip(fileList, textList):
+                self.__logger.debug("CVS checkout output %s revision %s is:\n%s\n", self.__testFilePath, rId, text)
+                # each file matches a single-file checkout of the same revision
+                checkPath = os.path.join(refPath, os.path.basename(outPath))
+                vc.checkOutFile(cvsPath=self.__testFilePath, outPath=checkPath, revId=rId)
+                self.assertTrue(os.path.isfile(outPath))
+                self.assertTrue(filecmp.cmp(checkPath, outPath, shallow=False))
         except:  # noqa: E722 pylint: disable=bare-except
             self.__logger.exception("Exception in %s", self.__class__.__name__)
             self.fail()
@@ -19,8 +19,9 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.01"
 
 import unittest
-import sys
+import io
 import os
+import tempfile
 
 from wwpdb.io.misc.FormatOut import FormatOut
 
@@ -40,8 +41,17 @@ class DataFileTests(unittest.TestCase):
 
         out = FormatOut()
         out.autoFormat("unitTest1 results", dict_in, 3, 3)
-        out.writeStream(sys.stdout)
-        out.write(os.devnull)
+        # Format into memory - no file needs to be opened to check the output
+        sIo = io.StringIO()
+        out.writeStream(sIo)
+        text = sIo.getvalue()
+        self.assertIn("CONTENTS OF DICTIONARY: unitTest1 results", text)
+        # The file path is exercised once, and must produce the same text
+        with tempfile.TemporaryDirectory() as tmpDir:
+            fPath = os.path.join(tmpDir, "fo.out")
+            out.write(fPath)
+            with open(fPath, "r") as ifh:
+                self.assertEqual(ifh.read(), text)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -28,11 +28,14 @@ import os
 import os.path
 import sys
 import platform
+import shutil
+import tempfile
+from collections import defaultdict
 
 from mmcif_utils.persist.PdbxPersist import PdbxPersist
 from mmcif_utils.persist.PdbxPyIoAdapter import PdbxPyIoAdapter as PdbxIoAdapter
 
-from wwpdb.io.graphics.GraphicsContext3D import GraphicsContext3D
+from wwpdb.io.graphics.GraphicsContext3D import GraphicsContext3D, getPersistIndex
 
 HERE = os.path.abspath(os.path.dirname(__file__))
 TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
@@ -43,11 +46,27 @@ mockTopPath = os.path.join(TOPDIR, "wwpdb", "mock-data")
 
 
 class GraphicsContext3DTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Read the test file and create its persistent store once for all test cases."""
+        # The store may span several files (e.g. dbm.dumb) - keep them in a private directory
+        cls._dbDir = tempfile.mkdtemp(prefix="persist-", dir=TESTOUTPUT)
+        cls._dbFile = os.path.join(cls._dbDir, "my.db")
+        myReader = PdbxIoAdapter(True, sys.stdout)
+        cls._readOk = myReader.read(pdbxFilePath=os.path.join(mockTopPath, "MODELS", "3rer.cif"))
+        if cls._readOk:
+            myPersist = PdbxPersist(True, sys.stdout)
+            myPersist.setContainerList(myReader.getContainerList())
+            myPersist.store(dbFileName=cls._dbFile)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._dbDir, ignore_errors=True)
+
     def setUp(self):
         self.__lfh = sys.stdout
         self.__verbose = True
         self.__debug = False
-        self.__pathPdbxDataFile = os.path.join(mockTopPath, "MODELS", "3rer.cif")
 
     def tearDown(self):
         pass
@@ -61,7 +80,7 @@ class GraphicsContext3DTests(unittest.TestCase):
         #
         try:
             myPersist = PdbxPersist(self.__verbose, self.__lfh)
-            indexD = myPersist.getIndex(dbFileName=persistFilePath)
+            indexD = getPersistIndex(persistFilePath, verbose=self.__verbose, log=self.__lfh)
             (firstContainerName, _firstContainerType) = indexD["__containers__"][0]
 
             if self.__debug:  # pragma: no cover
@@ -79,15 +98,11 @@ class GraphicsContext3DTests(unittest.TestCase):
         self.__lfh.write("\nStarting %s %s at %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name, time.strftime("%Y %m %d %H:%M:%S", time.localtime())))
 
         try:
+            self.assertTrue(self._readOk)
             gC = GraphicsContext3D(app3D="JMol", verbose=self.__verbose, log=self.__lfh)
-            myReader = PdbxIoAdapter(self.__verbose, self.__lfh)
-            ok = myReader.read(pdbxFilePath=self.__pathPdbxDataFile)
-            self.assertTrue(ok)
             myPersist = PdbxPersist(self.__verbose, self.__lfh)
-            myPersist.setContainerList(myReader.getContainerList())
-            dbFile = os.path.join(TESTOUTPUT, "my.db")
-            myPersist.store(dbFileName=dbFile)
-            indexD = myPersist.getIndex(dbFile)
+            dbFile = self._dbFile
+            indexD = getPersistIndex(dbFile, verbose=self.__verbose, log=self.__lfh)
 
             self.__lfh.write("Persistent index dictionary %r\n" % indexD.items())
 
@@ -112,10 +127,7 @@ class GraphicsContext3DTests(unittest.TestCase):
                         aL = myObj.getAttributeList()
                         rowList = myObj.getRowList()
                         for row in rowList:
-                            rD = {}
-                            for ii, rVal in enumerate(row):
-                                rD[aL[ii]] = rVal
-                            # self.__lfh.write("Row dictionary: %r\n" % rD.items())
+                            rD = dict(zip(aL, row))
                             gcS = gC.getGraphicsContext(categoryName=objectName, rowDictList=[rD])
                             self.__lfh.write("Context : %s\n" % gcS)
 
@@ -128,15 +140,10 @@ class GraphicsContext3DTests(unittest.TestCase):
         self.__lfh.write("\nStarting %s %s at %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name, time.strftime("%Y %m %d %H:%M:%S", time.localtime())))
         try:
             #
-            #  Create a persistent store for the test file --
+            #  Use the persistent store created for the test file --
             #
-            myReader = PdbxIoAdapter(self.__verbose, self.__lfh)
-            ok = myReader.read(pdbxFilePath=self.__pathPdbxDataFile)
-            self.assertTrue(ok)
-            myPersist = PdbxPersist(self.__verbose, self.__lfh)
-            myPersist.setContainerList(myReader.getContainerList())
-            outputDb = os.path.join(TESTOUTPUT, "my2.db")
-            myPersist.store(dbFileName=outputDb)
+            self.assertTrue(self._readOk)
+            outputDb = self._dbFile
             #
             # Open the persistent store and read the site details -
             #
@@ -147,9 +154,7 @@ class GraphicsContext3DTests(unittest.TestCase):
             gC.setPersistStorePath(persistFilePath=outputDb)
             #
             for row in mySite.getRowList():
-                rD = {}
-                for ii, rVal in enumerate(row):
-                    rD[aL[ii]] = rVal
+                rD = dict(zip(aL, row))
                 # rD now contains the row dictionary for this site row -
                 #
                 gcS = gC.getGraphicsContext(categoryName="struct_site", rowDictList=[rD])
@@ -163,15 +168,10 @@ class GraphicsContext3DTests(unittest.TestCase):
         self.__lfh.write("\nStarting %s %s at %s\n" % (self.__class__.__name__, sys._getframe().f_code.co_name, time.strftime("%Y %m %d %H:%M:%S", time.localtime())))
         try:
             #
-            #  Create a persistent store for the test file --
+            #  Use the persistent store created for the test file --
             #
-            myReader = PdbxIoAdapter(self.__verbose, self.__lfh)
-            ok = myReader.read(pdbxFilePath=self.__pathPdbxDataFile)
-            self.assertTrue(ok)
-            myPersist = PdbxPersist(self.__verbose, self.__lfh)
-            myPersist.setContainerList(myReader.getContainerList())
-            outputDb = os.path.join(TESTOUTPUT, "my2.db")
-            myPersist.store(dbFileName=outputDb)
+            self.assertTrue(self._readOk)
+            outputDb = self._dbFile
             #
             # Open the persistent store and read the site details -
             #
@@ -181,9 +181,7 @@ class GraphicsContext3DTests(unittest.TestCase):
             #
             # idList will hold the identifiers for each site.
             #
-            idList = []
-            for row in mySite.getRowList():
-                idList.append(row[idx])
+            idList = [row[idx] for row in mySite.getRowList()]
 
             #
             #
@@ -192,18 +190,13 @@ class GraphicsContext3DTests(unittest.TestCase):
             idx = aL.index("site_id")
             #
             #  Get the graphics context for structure details for each site.
+            #  Bucket the row dictionaries by site in a single pass over struct_site_gen.
+            siteRowD = defaultdict(list)
+            for row in mySiteGen.getRowList():
+                siteRowD[row[idx]].append(dict(zip(aL, row)))
             gC = GraphicsContext3D(app3D="JMol", verbose=self.__verbose, log=self.__lfh)
             for eid in idList:
-                rDL = []
-                for row in mySiteGen.getRowList():
-                    if eid == row[idx]:
-                        # create a row dictionary
-                        rD = {}
-                        for ii, rVal in enumerate(row):
-                            rD[aL[ii]] = rVal
-                        # self.__lfh.write("Row dictionary: %r\n" % rD.items())
-                        rDL.append(rD)
-                gcS = gC.getGraphicsContext(categoryName="struct_site_gen", rowDictList=rDL)
+                gcS = gC.getGraphicsContext(categoryName="struct_site_gen", rowDictList=siteRowD.get(eid, []))
                 self.__lfh.write("Site %s context : %s\n" % (eid, gcS))
 
         except:  # noqa: E722 pylint: disable=bare-except # pragma: no cover
@@ -30,34 +30,31 @@ class ReleaseFileNamesTests(unittest.TestCase):
     def testNames(self):
         """Tests that retrieving different file names is successful"""
         rf = ReleaseFileNames()
-        print("Pub model %s" % rf.get_model("1abc"))
-        print("Rel model %s" % rf.get_model("1abc", True))
-        print("Pub sf: %s" % rf.get_structure_factor("1abc"))
-        print("Rel sf: %s" % rf.get_structure_factor("1abc", True))
-        print("Pub cs: %s" % rf.get_chemical_shifts("1abc"))
-        print("Rel cs: %s" % rf.get_chemical_shifts("1abc", True))
-        print("Pub emdxml: %s" % rf.get_emdb_xml("EMD-1234"))
-        print("Rel emdxml: %s" % rf.get_emdb_xml("EMD-1234", True))
-        print("Pub emdmap: %s" % rf.get_emdb_map("EMD-1234"))
-        print("Rel emdmap: %s" % rf.get_emdb_map("EMD-1234", True))
-        print("Pub emdfsc: %s" % rf.get_emdb_fsc("EMD-1234"))
-        print("Rel emdfsc: %s" % rf.get_emdb_fsc("EMD-1234", True))
-        print("Pub validpdf: %s" % rf.get_validation_pdf("1abc"))
-        print("Rel validpdf: %s" % rf.get_validation_pdf("1abc", True))
-        print("Pub validfullpdf: %s" % rf.get_validation_full_pdf("1abc"))
-        print("Rel validfullpdf: %s" % rf.get_validation_full_pdf("1abc", True))
-        print("Pub validxml: %s" % rf.get_validation_xml("1abc"))
-        print("Rel validxml: %s" % rf.get_validation_xml("1abc", True))
-        print("Pub validsvg: %s" % rf.get_validation_svg("1abc"))
-        print("Rel validsvg: %s" % rf.get_validation_svg("1abc", True))
-        print("Pub validpng: %s" % rf.get_validation_png("1abc"))
-        print("Rel validpng: %s" % rf.get_validation_png("1abc", True))
-        print("Pub 2fo-fc: %s" % rf.get_validation_2fofc("1abc"))
-        print("Rel 2fo-fc: %s" % rf.get_validation_2fofc("1abc", True))
-        print("Pub fo-fc: %s" % rf.get_validation_fofc("1abc"))
-        print("Rel fo-fc: %s" % rf.get_validation_fofc("1abc", True))
+        # (getter, accession, public name, for_release name)
+        nameL = [
+            ("get_model", "1abc", "1abc.cif.gz", "1abc.cif.gz"),
+            ("get_structure_factor", "1abc", "r1abcsf.ent.gz", "1abc-sf.cif"),
+            ("get_chemical_shifts", "1abc", "1abc_cs.str.gz", "1abc_cs.str"),
+            ("get_emdb_xml", "EMD-1234", "emd-1234-v30.xml", "emd_1234_v3.xml"),
+            ("get_emdb_map", "EMD-1234", "emd_1234.map.gz", "emd_1234.map.gz"),
+            ("get_emdb_fsc", "EMD-1234", "emd_1234_fsc.xml", "emd_1234_fsc.xml"),
+            ("get_validation_pdf", "1abc", "1abc_validation.pdf", "1abc_validation.pdf"),
+            ("get_validation_full_pdf", "1abc", "1abc_full_validation.pdf", "1abc_full_validation.pdf"),
+            ("get_validation_xml", "1abc", "1abc_validation.xml", "1abc_validation.xml"),
+            ("get_validation_svg", "1abc", "1abc_multipercentile_validation.svg", "1abc_multipercentile_validation.svg"),
+            ("get_validation_png", "1abc", "1abc_multipercentile_validation.png", "1abc_multipercentile_validation.png"),
+            ("get_validation_2fofc", "1abc", "1abc_validation_2fo-fc_map_coef.cif", "1abc_validation_2fo-fc_map_coef.cif"),
+            ("get_validation_fofc", "1abc", "1abc_validation_fo-fc_map_coef.cif", "1abc_validation_fo-fc_map_coef.cif"),
+        ]
+        for method, accession, pubName, relName in nameL:
+            with self.subTest(method=method):
+                getter = getattr(rf, method)
+                self.assertEqual(getter(accession), pubName)
+                self.assertEqual(getter(accession, True), relName)
+                # repeated lookups are served from the cache
+                self.assertIs(getter(accession), getter(accession))
         # External use...
-        rf.get_lower_emdb_hyphen_format("EMD-1234")
+        self.assertEqual(rf.get_lower_emdb_hyphen_format("EMD-1234"), "emd-1234")
 
 
 if __name__ == "__main__":  # pragma: no cover
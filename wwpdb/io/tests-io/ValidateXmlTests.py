@@ -18,6 +18,7 @@ __email__ = "peisach@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.01"
 
+import io
 import unittest
 import os
 
@@ -27,6 +28,35 @@ HERE = os.path.abspath(os.path.dirname(__file__))
 TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
 mockTopPath = os.path.join(TOPDIR, "wwpdb", "mock-data")
 
+# One of each element type the parser handles - the expected values are those given by the original DOM based parser
+INLINE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<wwPDB-validation-information>
+  <Entry DCC_Rfree="0.30" PDB-Rfree="0.22" DCC_R="0.20" PDB-R="0.19" DataCompleteness="97.5" clashscore="4.5" percent-RSRZ-outliers="NotAvailable" atom_inclusion_all_atoms="0.35"/>
+  <programs><program name="molprobity"/></programs>
+  <ModelledEntityInstance model="1" chain="A" ent="1" average_residue_inclusion="0.05"/>
+  <ModelledEntityInstance model="1" chain="B" ent="1" average_residue_inclusion="0.50"/>
+  <ModelledSubgroup model="1" ent="1" chain="A" resname="ALA" resnum="10" icode=" " altcode=" " rama="OUTLIER" phi="60.1" psi="-170.2" rsrz="6.1">
+    <clash atom="CB" cid="1" clashmag="0.6" dist="2.1"/>
+    <bond-outlier atom0="CA" atom1="CB" mean="1.53" stdev="0.02" obs="1.70" z="8.5" link="no"/>
+    <bond-outlier atom0="C" atom1="N" mean="1.33" stdev="0.02" obs="1.50" z="8.5" link="yes"/>
+    <mog-angle-outlier atoms="C1,C2,C3" mean="109.0" mindiff="1.0" stdev="1.0" numobs="10" Zscore="3.0" obsval="112.0"/>
+  </ModelledSubgroup>
+  <ModelledSubgroup model="1" ent="2" chain="C" resname="HEM" resnum="201" icode=" " altcode=" " ligRSRZ="7.2">
+    <clash atom="OD1" cid="1" clashmag="0.6" dist="2.1"/>
+    <clash atom="HB" cid="2" clashmag="0.5" dist="2.0"/>
+    <chiral-outlier atom="FE" problem="WRONG HAND"/>
+  </ModelledSubgroup>
+  <ModelledSubgroup model="1" ent="1" chain="A" resname="GLY" resnum="11" icode=" " altcode=" " rsrz="1.2"/>
+  <chemical_shift_list file_id="0" number_of_errors_while_mapping="2" number_of_warnings_while_mapping="1">
+    <unmapped_chemical_shift chain="A" resnum="99" rescode="LYS" atom="HA" value="4.1" error="0.01" ambiguity="1" diagnostic="Residue not found in structure."/>
+    <unmapped_chemical_shift chain="A" resnum="10" rescode="ALA" atom="HZ" value="1.1" diagnostic="Atom not found"/>
+    <chemical_shift_outlier chain="A" resnum="10" rescode="ALA" atom="CA" value="70.0" prediction="52.0" zscore="6.5"/>
+    <referencing_offset atom="CA" number_of_measurements="50" precision="0.1" uncertainty="0.2" value="1.5"/>
+    <referencing_offset atom="CB" number_of_measurements="50" precision="0.1" uncertainty="0.5" value="0.1"/>
+  </chemical_shift_list>
+</wwPDB-validation-information>
+"""
+
 
 class ReleaseFileNamesTests(unittest.TestCase):
     def setUp(self):
@@ -49,6 +79,53 @@ class ReleaseFileNamesTests(unittest.TestCase):
             obj.getSummary()
             obj.getOutlier("torsion-outlier")
 
+    def testParseInline(self):
+        """Tests the parsed values against those from the original DOM based parser"""
+        obj = ValidateXml(io.BytesIO(INLINE_XML.encode("utf-8")))
+        self.assertEqual(obj.getSummary(), {"DCC_Rfree": 0.3, "atom_inclusion_all_atoms": 0.35, "clashscore": 4.5})
+        self.assertEqual(obj.getCalculatedCompleteness(), "97.5")
+        self.assertEqual(obj.getOutlier("atom_inclusion_all_atoms"), "0.35")
+        self.assertEqual(obj.getOutlier("r_free_diff"), [{"DCC_Rfree": "0.30", "PDB-Rfree": "0.22", "diff": str(abs(0.30 - 0.22))}])
+        self.assertEqual(obj.getOutlier("r_work_diff"), [])
+        self.assertEqual(obj.getOutlier("chain_average_residue_inclusion"), [{"average_residue_inclusion": 5.0, "chain": "A", "model": "1"}])
+        resA = {"model": "1", "ent": "1", "chain": "A", "resname": "ALA", "resnum": "10", "icode": ""}
+        resC = {"model": "1", "ent": "2", "chain": "C", "resname": "HEM", "resnum": "201", "icode": ""}
+        self.assertEqual(obj.getOutlier("torsion-outlier"), [dict(resA, phi="60.1", psi="-170.2")])
+        self.assertEqual(obj.getOutlier("polymer-rsrz-outlier"), [dict(resA, rsrz="6.1")])
+        self.assertEqual(obj.getOutlier("ligand-rsrz-outlier"), [dict(resC, ligRSRZ="7.2")])
+        # the C-N polymer linkage is skipped
+        self.assertEqual(obj.getOutlier("bond-outlier"), [dict(resA, atom0="CA", atom1="CB", mean="1.53", stdev="0.02", obs="1.70", z="8.5", link="no")])
+        self.assertEqual(obj.getOutlier("mog-angle-outlier"), [])
+        self.assertEqual(obj.getOutlier("chiral-outlier"), [dict(resC, atom="FE", problem="WRONG HAND")])
+        self.assertEqual(len(obj.getOutlier("clash")), 3)
+        self.assertEqual(
+            obj.getClashOutliers(),
+            [
+                {
+                    "res1model": "1",
+                    "res1num": "10",
+                    "res1name": "ALA",
+                    "res1chain": "A",
+                    "res1alt": "",
+                    "res1atom": "CB",
+                    "res2model": "1",
+                    "res2num": "201",
+                    "res2chain": "C",
+                    "res2alt": "",
+                    "res2name": "HEM",
+                    "res2atom": "OD1",
+                    "dist": "2.1",
+                    "clashmag": "0.6",
+                }
+            ],
+        )
+        self.assertEqual(obj.getCsMappingErrorNumber(), 2)
+        self.assertEqual(obj.getCsMappingWarningNumber(), 1)
+        self.assertEqual(obj.getNotFoundInStructureCsList(), [["A", "99", "LYS", "HA", "4.1", "0.01", "1"], ["A", "10", "ALA", "HZ", "1.1", "", ""]])
+        self.assertEqual(obj.getNotFoundResidueInStructureCsList(), [["A", "99", "LYS", "HA", "4.1", "0.01", "1"]])
+        self.assertEqual(obj.getCsOutliers(), [["A", "10", "ALA", "CA", "70.0", "52.0", "6.5"]])
+        self.assertTrue(obj.getCsReferencingOffsetFlag())
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -0,0 +1,23 @@
+##
+# File:    conftest.py
+#
+# pytest hooks for the tests-io test modules.
+##
+"""
+Keep the test modules that share a scratch sandbox or persistent store on a single pytest-xdist worker.
+
+"""
+
+import os
+
+import pytest
+
+# Test modules whose test cases must not be spread across pytest-xdist workers (--dist=loadgroup)
+XDIST_GROUP_MODULES = ("CvsUtilityTests.py", "GraphicsContext3DTests.py")
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        fn = os.path.basename(str(item.fspath))
+        if fn in XDIST_GROUP_MODULES:
+            item.add_marker(pytest.mark.xdist_group(name=os.path.splitext(fn)[0]))